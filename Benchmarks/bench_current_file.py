@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Measures getCurrentFileName under heavy polling with and without the
+# event-driven current file tracker, using the stub host modules. Every
+# call into hiero.ui costs --call-delay seconds and a sequence change event
+# is sent every --event-interval queries.
+#
+# usage: python bench_current_file.py [--queries 100000] [--call-delay 0.00002]
+#
+
+import os
+import sys
+import time
+import argparse
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(benchDir, "stubs"), os.path.join(os.path.dirname(benchDir), "Scripts")]
+os.environ.setdefault("USER", "prism")
+
+import hiero
+import PrismCore
+
+
+class Sequence(object):
+    def __init__(self, project):
+        self._project = project
+
+    def project(self):
+        hiero.ui.simulateCallCost()
+        return self._project
+
+
+def poll(plugin, core, queries, eventInterval):
+    start = time.time()
+    for idx in range(queries):
+        if eventInterval and idx % eventInterval == 0:
+            hiero.core.events.sendEvent("kPlaybackSrcChanged")
+
+        plugin.getCurrentFileName(core)
+
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--call-delay", type=float, default=0.00002)
+    parser.add_argument("--event-interval", type=int, default=1000)
+    args = parser.parse_args()
+
+    core = PrismCore.PrismCore(app="Hiero", prismArgs=["noUI"])
+    plugin = core.appPlugin
+    project = hiero.core.openProject(os.path.join(core.projectPath, "shot_v0001.hrox"))
+    hiero.ui._activeSequence = Sequence(project)
+    hiero.ui.callDelay = args.call_delay
+
+    results = {}
+    tracker = plugin.currentFileTracker
+    results["direct"] = poll(plugin, core, args.queries, args.event_interval)
+    directRefreshes = tracker.stats["refreshes"]
+
+    tracker.useEventLoop = False
+    tracker.register()
+    tracker.stats["refreshes"] = 0
+    results["tracked"] = poll(plugin, core, args.queries, args.event_interval)
+
+    for mode, refreshes in [("direct", directRefreshes), ("tracked", tracker.stats["refreshes"])]:
+        print(
+            "%-8s %.2fus/query  %s path lookups for %s queries"
+            % (mode, results[mode] * 1000000 / args.queries, refreshes, args.queries)
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
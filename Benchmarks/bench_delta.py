@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Compares saving and opening a series of project versions as full copies
+# against the delta versioning of Prism_Hiero_Delta, using synthetic .hrox
+# files.
+#
+# usage: python bench_delta.py [--clips 100000] [--versions 20] [--edits 20]
+#
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(benchDir), "Scripts"))
+
+import Prism_Hiero_Delta
+
+
+def createProject(clips):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>\n', "<hieroXML>\n"]
+    for idx in range(clips):
+        lines.append(
+            '  <Clip name="clip_%06d" guid="{%032x}">\n'
+            '    <MediaSource file="/mnt/projects/media/shot_%06d/plate.####.exr" first="1001" last="%d"/>\n'
+            "  </Clip>\n" % (idx, idx, idx, 1001 + idx % 200)
+        )
+
+    lines.append("</hieroXML>\n")
+    return lines
+
+
+def editProject(lines, edits):
+    for idx in range(edits):
+        pos = random.randrange(2, len(lines) - 1)
+        lines[pos] = lines[pos].replace('last="', 'last="1').replace('name="', 'name="x')
+
+    lines.insert(len(lines) - 1, '  <Clip name="added_%s"/>\n' % random.random())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", type=int, default=100000)
+    parser.add_argument("--versions", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--keyframe-interval", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(0)
+    lines = createProject(args.clips)
+    tmpDir = tempfile.mkdtemp(prefix="prismDeltaBench_")
+    fullDir = os.path.join(tmpDir, "full")
+    deltaDir = os.path.join(tmpDir, "delta")
+    os.makedirs(fullDir)
+    os.makedirs(deltaDir)
+
+    stats = {
+        "full": {"save": 0.0, "open": 0.0, "bytes": 0},
+        "delta": {"save": 0.0, "open": 0.0, "bytes": 0},
+    }
+    try:
+        basePath = None
+        baseData = None
+        for version in range(1, args.versions + 1):
+            editProject(lines, args.edits)
+            data = "".join(lines).encode("utf-8")
+            filename = "shot_v%04d.hrox" % version
+
+            path = os.path.join(fullDir, filename)
+            start = time.time()
+            stats["full"]["bytes"] += Prism_Hiero_Delta.writeFull(path, data)
+            stats["full"]["save"] += time.time() - start
+            start = time.time()
+            with open(path, "rb") as f:
+                f.read()
+            stats["full"]["open"] += time.time() - start
+
+            path = os.path.join(deltaDir, filename)
+            start = time.time()
+            kind, written = Prism_Hiero_Delta.writeVersion(
+                path,
+                data,
+                basePath=basePath,
+                baseData=baseData,
+                keyframeInterval=args.keyframe_interval,
+            )
+            stats["delta"]["bytes"] += written
+            stats["delta"]["save"] += time.time() - start
+            start = time.time()
+            if Prism_Hiero_Delta.readFile(path) != data:
+                raise Exception("rebuilt data of %s doesn't match" % path)
+            stats["delta"]["open"] += time.time() - start
+
+            basePath = path
+            baseData = data
+    finally:
+        shutil.rmtree(tmpDir)
+
+    print(
+        "%s versions of a %.1fMB project, %s edits per version"
+        % (args.versions, len(data) / 1024.0 / 1024.0, args.edits)
+    )
+    for mode in ["full", "delta"]:
+        result = stats[mode]
+        print(
+            "%-6s save %.1fms/version  open %.1fms/version  written %.2fMB"
+            % (
+                mode,
+                result["save"] * 1000 / args.versions,
+                result["open"] * 1000 / args.versions,
+                result["bytes"] / 1024.0 / 1024.0,
+            )
+        )
+
+    return stats
+
+
+if __name__ == "__main__":
+    main()
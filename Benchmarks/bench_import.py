@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Measures how long it takes to import the Hiero plugin and to create the
+# plugin instance, using the stub host modules in ./stubs.
+#
+# usage: python bench_import.py [--runs 20] [--import-delay 0.05]
+#
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+scriptDir = os.path.join(os.path.dirname(benchDir), "Scripts")
+stubDir = os.path.join(benchDir, "stubs")
+
+hostModules = ["nuke", "hiero", "PySide2", "PySide2.QtCore", "PySide2.QtWidgets"]
+
+runCode = """
+import sys, time, json
+sys.path[:0] = [%r, %r]
+import PrismCore
+core = PrismCore.PrismCore(prismArgs=["noUI"])
+start = time.time()
+import %s as pluginModule
+plugin = getattr(pluginModule, %r)(core)
+elapsed = time.time() - start
+print(json.dumps({"time": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure(module, className, runs, env):
+    code = runCode % (stubDir, scriptDir, module, className, hostModules)
+    results = []
+    for idx in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        results.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+
+    times = sorted(r["time"] for r in results)
+    return {
+        "min": times[0],
+        "median": times[len(times) // 2],
+        "max": times[-1],
+        "hostModulesLoaded": results[-1]["loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--import-delay",
+        type=float,
+        default=0.0,
+        help="simulated import time of each stub host module in seconds",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PRISM_BENCH_IMPORT_DELAY"] = str(args.import_delay)
+    env.setdefault("USER", "prism")
+
+    report = {}
+    for module, className in [
+        ("Prism_Hiero_init", "Prism_Plugin_Hiero"),
+        ("Prism_Hiero_init_unloaded", "Prism_Hiero_unloaded"),
+    ]:
+        report[module] = measure(module, className, args.runs, env)
+        result = report[module]
+        print(
+            "%-28s min %.2fms  median %.2fms  max %.2fms  host modules loaded: %s"
+            % (
+                module,
+                result["min"] * 1000,
+                result["median"] * 1000,
+                result["max"] * 1000,
+                ", ".join(result["hostModulesLoaded"]) or "none",
+            )
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
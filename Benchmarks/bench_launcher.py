@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Compares the time to open a project in a freshly started process with
+# the launcher pool of Prism_Hiero_Launcher, using fake_hiero.py as the
+# application.
+#
+# usage: python bench_launcher.py [--opens 5] [--startup-delay 2]
+#
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(benchDir), "Scripts"))
+
+import Prism_Hiero_Launcher
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--opens", type=int, default=5)
+    parser.add_argument("--startup-delay", type=float, default=2.0)
+    parser.add_argument("--open-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    os.environ["FAKE_HIERO_STARTUP_DELAY"] = str(args.startup_delay)
+    os.environ["FAKE_HIERO_OPEN_DELAY"] = str(args.open_delay)
+    appPath = sys.executable
+    appArgs = [os.path.join(benchDir, "fake_hiero.py"), "--hiero"]
+
+    fd, projectPath = tempfile.mkstemp(suffix=".hrox")
+    os.close(fd)
+
+    start = time.time()
+    subprocess.check_call([appPath] + appArgs + [projectPath])
+    coldTime = time.time() - start
+
+    pool = Prism_Hiero_Launcher.Prism_Hiero_LauncherPool()
+    pool.warm(appPath, appArgs)
+    try:
+        for idx in range(args.opens):
+            # the user picks the next version a while after the last one
+            deadline = time.time() + args.startup_delay * 5
+            key = pool.getKey(appPath, appArgs)
+            while key not in pool.idle and time.time() < deadline:
+                time.sleep(0.01)
+
+            if not pool.open(appPath, appArgs, projectPath):
+                print("no warm process was ready for open %s" % idx)
+
+        deadline = time.time() + 10
+        while len(pool.metrics) < args.opens and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.shutdown()
+        os.remove(projectPath)
+
+    warmTimes = [metric["timeToOpen"] for metric in pool.metrics]
+    print("cold start and open: %.3fs" % coldTime)
+    if warmTimes:
+        print(
+            "warm open: %s opens, mean %.3fs, max %.3fs"
+            % (len(warmTimes), sum(warmTimes) / len(warmTimes), max(warmTimes))
+        )
+
+
+if __name__ == "__main__":
+    main()
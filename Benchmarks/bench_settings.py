@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Counts the user config reads of repeated launches through
+# customizeExecutable. The stub core reads the config file on every
+# getConfig call with a simulated network delay, like Prism does with a
+# config on slow storage. Exits with 1 if the launches after the first one
+# read the config.
+#
+# usage: python bench_settings.py [--launches 1000] [--read-delay 0.005]
+#
+
+import os
+import sys
+import json
+import time
+import argparse
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(benchDir, "stubs"), os.path.join(os.path.dirname(benchDir), "Scripts")]
+os.environ.setdefault("USER", "prism")
+
+import PrismCore
+
+
+class FileConfigCore(PrismCore.PrismCore):
+    readDelay = 0.0
+    reads = 0
+
+    def getConfig(self, cat=None, param=None, config=None, configPath=None):
+        if config or configPath:
+            return PrismCore.PrismCore.getConfig(self, cat, param, config, configPath)
+
+        FileConfigCore.reads += 1
+        time.sleep(self.readDelay)
+        with open(self.userini, "r") as f:
+            self.config = json.load(f)
+
+        return PrismCore.PrismCore.getConfig(self, cat, param)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=1000)
+    parser.add_argument("--read-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    core = FileConfigCore(app="Hiero", prismArgs=["noUI"])
+    with open(core.userini, "w") as f:
+        json.dump({"hiero": {"usenukestudio": True}}, f)
+
+    FileConfigCore.readDelay = args.read_delay
+    plugin = core.appPlugin
+    launches = []
+    plugin.launchScene = lambda appPath, flag, filepath: launches.append(flag)
+
+    start = time.time()
+    plugin.customizeExecutable(core, "/usr/bin/true", "/tmp/shot_v0001.hrox")
+    firstTime = time.time() - start
+    firstReads = FileConfigCore.reads
+
+    start = time.time()
+    for idx in range(args.launches - 1):
+        plugin.customizeExecutable(core, "/usr/bin/true", "/tmp/shot_v0001.hrox")
+
+    repeatTime = time.time() - start
+    repeatReads = FileConfigCore.reads - firstReads
+
+    print("first launch:    %.3fms, %s config reads" % (firstTime * 1000, firstReads))
+    print(
+        "%s launches: %.3fms/launch, %s config reads, %s mtime checks"
+        % (args.launches - 1, repeatTime * 1000 / max(1, args.launches - 1), repeatReads, plugin.settings.stats["checks"])
+    )
+    print("launch flags: %s" % sorted(set(launches)))
+
+    with open(core.userini, "w") as f:
+        json.dump({"hiero": {"usenukestudio": False}}, f)
+
+    os.utime(core.userini, (time.time() + 10, time.time() + 10))
+    plugin.settings.lastCheck = 0
+    plugin.customizeExecutable(core, "/usr/bin/true", "/tmp/shot_v0001.hrox")
+    print("after a config change: %s" % launches[-1])
+
+    return 1 if repeatReads or launches[-1] != "--hiero" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Runs the headless branch of Integration/hiero_init.py against the stub
+# host modules in ./stubs and checks the measured startup time against a
+# budget. Exits with a non-zero code if the budget is exceeded or if the
+# headless startup touched any UI module.
+#
+# usage: python bench_startup.py [--runs 20] [--budget 100]
+#
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+rootDir = os.path.dirname(benchDir)
+stubDir = os.path.join(benchDir, "stubs")
+initFile = os.path.join(rootDir, "Integration", "hiero_init.py")
+
+uiModules = ["PySide2", "PySide2.QtCore", "PySide2.QtGui", "PySide2.QtWidgets"]
+
+runCode = """
+import sys, time, json
+sys.path.insert(0, %r)
+import nuke
+nuke.env["gui"] = False
+code = compile(open(%r).read().replace("PRISMROOT", repr(%r)), "hiero_init.py", "exec")
+start = time.time()
+scope = {}
+exec(code, scope)
+elapsed = time.time() - start
+pcore = scope.get("pcore")
+print(json.dumps({
+    "time": elapsed,
+    "loaded": pcore is not None and pcore.appPlugin is not None,
+    "messageParent": pcore is not None and pcore.messageParent is not None,
+    "uiModules": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def measure(runs, env):
+    code = runCode % (stubDir, initFile, rootDir, uiModules)
+    results = []
+    for idx in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        results.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--budget", type=float, default=100.0, help="startup budget in milliseconds"
+    )
+    parser.add_argument(
+        "--import-delay",
+        type=float,
+        default=0.0,
+        help="simulated import time of each stub host module in seconds",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PRISM_BENCH_IMPORT_DELAY"] = str(args.import_delay)
+    env["PRISM_ROOT"] = rootDir
+    env.setdefault("USER", "prism")
+
+    results = measure(args.runs, env)
+    times = sorted(r["time"] * 1000 for r in results)
+    median = times[len(times) // 2]
+    print(
+        "headless startup: min %.2fms  median %.2fms  max %.2fms  budget %.2fms"
+        % (times[0], median, times[-1], args.budget)
+    )
+
+    errors = []
+    if not all(r["loaded"] for r in results):
+        errors.append("Prism was not loaded")
+
+    if any(r["messageParent"] for r in results):
+        errors.append("a messageParent was created")
+
+    loadedUiModules = sorted(set(m for r in results for m in r["uiModules"]))
+    if loadedUiModules:
+        errors.append("UI modules were imported: %s" % ", ".join(loadedUiModules))
+
+    if median > args.budget:
+        errors.append("median startup time exceeds the budget")
+
+    for error in errors:
+        print("FAILED: %s" % error)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+#
+# Times the main entry points of the plugin against the stub host modules
+# in ./stubs at synthetic scales and keeps the results in a JSON history.
+# Each case and scale runs in a fresh process. A result is a regression if
+# its median is more than --tolerance slower than the median of the last
+# --baseline-runs runs recorded on the same machine and Python version.
+#
+# usage: python bench_suite.py [--cases startup,saveScene] [--scales 1,100,10000]
+#                              [--history results/history.json] [--no-save]
+#
+# cases and their scale:
+#   startup                 top level widgets in the session
+#   reload                  top level widgets, startup again in the same session
+#   openScene               projects already open
+#   saveScene               shots in the active sequence
+#   global_addRenderPaths   render locations of the Prism project
+#   addIntegration          install paths, one addIntegration call each
+#   removeIntegration       install paths, one removeIntegration call each
+#
+
+import os
+import sys
+import json
+import time
+import argparse
+import shutil
+import platform
+import tempfile
+import subprocess
+
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+rootDir = os.path.dirname(benchDir)
+
+caseNames = [
+    "startup",
+    "reload",
+    "openScene",
+    "saveScene",
+    "global_addRenderPaths",
+    "addIntegration",
+    "removeIntegration",
+]
+
+
+def setupPaths():
+    """Sets up the import paths and a temporary folder, which holds all
+    temporary files of the case, including the projects of the stub core
+    and the staging files. Returns the folder."""
+    sys.path[:0] = [os.path.join(benchDir, "stubs"), os.path.join(rootDir, "Scripts")]
+    os.environ.setdefault("USER", "prism")
+    tmpDir = tempfile.mkdtemp(prefix="prismBench_")
+    tempfile.tempdir = tmpDir
+    os.environ["PRISM_HIERO_CACHE"] = tempfile.mkdtemp(prefix="prismBenchCache_")
+    return tmpDir
+
+
+def resetHost(topLevelWidgets=0):
+    import hiero
+    from PySide2 import QtWidgets
+
+    for widget in QtWidgets.QApplication._topLevelWidgets:
+        widget.deleteLater()
+
+    if hiero.ui._menuBar is not None:
+        hiero.ui._menuBar.deleteLater()
+
+    hiero.core.events.handlers = {}
+    del hiero.core._projects[:]
+    hiero.ui._activeSequence = None
+    hiero.ui._menuBar = None
+    QtWidgets.QApplication._topLevelWidgets = [QtWidgets.QWidget() for idx in range(topLevelWidgets)]
+    QtWidgets.QApplication._topLevelWidgets.append(
+        QtWidgets.QMainWindow(className="Foundry::UI::DockMainWindow")
+    )
+
+
+def createCore():
+    import PrismCore
+
+    return PrismCore.PrismCore(app="Hiero")
+
+
+def createSequence(project, shots):
+    import hiero
+
+    sequence = project.addSequence(hiero.core.Sequence("cut"))
+    track = sequence.addTrack(hiero.core.VideoTrack("Video 1"))
+    for idx in range(shots):
+        track.addItem(
+            hiero.core.TrackItem("sq%03d-sh%05d" % (idx // 100, idx), idx * 50, idx * 50 + 49, 1001, 1050)
+        )
+
+    return sequence
+
+
+class Resolver(object):
+    def __init__(self):
+        self.entries = []
+
+    def addResolver(self, token, description, path):
+        self.entries.append((token, description, path))
+
+
+def case_startup(scale, repeat):
+    # the plugin modules are imported once, like in a session which reloads
+    # the plugin, so a first startup also loads the components created on
+    # first use
+    resetHost(topLevelWidgets=scale)
+    createCore()
+
+    times = []
+    for idx in range(repeat):
+        resetHost(topLevelWidgets=scale)
+        start = time.time()
+        createCore()
+        times.append(time.time() - start)
+
+    return times
+
+
+def case_reload(scale, repeat):
+    import hiero
+
+    resetHost(topLevelWidgets=scale)
+    createCore()
+    times = []
+    for idx in range(repeat):
+        hiero.core.events.handlers = {}
+        start = time.time()
+        createCore()
+        times.append(time.time() - start)
+
+    return times
+
+
+def case_openScene(scale, repeat):
+    import hiero
+
+    resetHost()
+    core = createCore()
+    folder = tempfile.mkdtemp(prefix="prismBenchOpen_")
+    for idx in range(scale):
+        hiero.core.openProject(os.path.join(folder, "open_v%05d.hrox" % idx))
+
+    source = hiero.core.Project(os.path.join(folder, "source.hrox"))
+    createSequence(source, 100)
+    xml = source.toXml()
+    times = []
+    for idx in range(repeat):
+        path = os.path.join(folder, "shot_v%05d.hrox" % idx)
+        with open(path, "w") as f:
+            f.write(xml)
+
+        start = time.time()
+        core.appPlugin.openScene(core, path)
+        times.append(time.time() - start)
+
+    return times
+
+
+def case_saveScene(scale, repeat):
+    import hiero
+
+    resetHost()
+    core = createCore()
+    folder = tempfile.mkdtemp(prefix="prismBenchSave_")
+    project = hiero.core.openProject(os.path.join(folder, "shot_v0000.hrox"))
+    hiero.ui._activeSequence = createSequence(project, scale)
+    times = []
+    for idx in range(repeat):
+        start = time.time()
+        core.appPlugin.saveScene(core, os.path.join(folder, "shot_v%04d.hrox" % (idx + 1)))
+        times.append(time.time() - start)
+
+    return times
+
+
+def case_global_addRenderPaths(scale, repeat):
+    resetHost()
+    core = createCore()
+    core.extraRenderLocations = scale
+    times = []
+    for idx in range(repeat):
+        core.appPlugin.invalidateRenderPathCache()
+        start = time.time()
+        core.appPlugin.global_addRenderPaths(Resolver())
+        times.append(time.time() - start)
+
+    return times
+
+
+def createInstallPaths(scale):
+    folder = tempfile.mkdtemp(prefix="prismBenchInstall_")
+    paths = []
+    for idx in range(scale):
+        path = os.path.join(folder, "user%05d" % idx, ".nuke")
+        os.makedirs(path)
+        paths.append(path)
+
+    return paths
+
+
+def case_addIntegration(scale, repeat):
+    resetHost()
+    core = createCore()
+    times = []
+    for idx in range(repeat):
+        paths = createInstallPaths(scale)
+        start = time.time()
+        for path in paths:
+            core.appPlugin.addIntegration(path)
+
+        times.append(time.time() - start)
+
+    return times
+
+
+def case_removeIntegration(scale, repeat):
+    resetHost()
+    core = createCore()
+    times = []
+    for idx in range(repeat):
+        paths = createInstallPaths(scale)
+        core.appPlugin.installIntegrations(paths)
+        start = time.time()
+        for path in paths:
+            core.appPlugin.removeIntegration(path)
+
+        times.append(time.time() - start)
+
+    return times
+
+
+def runCase(name, scale, repeat):
+    tmpDir = setupPaths()
+    import logging
+
+    logging.disable(logging.WARNING)
+    devnull = open(os.devnull, "w")
+    stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        times = globals()["case_" + name](scale, repeat)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+        tempfile.tempdir = None
+        shutil.rmtree(tmpDir, ignore_errors=True)
+
+    print(json.dumps(times))
+
+
+def measure(name, scale, repeat):
+    # fewer repeats for the large scales, so a full run stays in minutes
+    repeat = max(1, min(repeat, int(repeat * 100 / max(scale, 1)) or 1))
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--run-case", name, str(scale), str(repeat)]
+    )
+    times = sorted(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+    return {
+        "median": times[len(times) // 2],
+        "min": times[0],
+        "max": times[-1],
+        "runs": len(times),
+    }
+
+
+def getCommit():
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=rootDir, stderr=subprocess.STDOUT
+        )
+        return output.decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def getMachine():
+    return "%s-%s-py%s" % (platform.node(), platform.system(), ".".join(platform.python_version_tuple()[:2]))
+
+
+def loadHistory(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return []
+
+
+def saveHistory(path, history):
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+
+    tmpPath = path + ".tmp"
+    with open(tmpPath, "w") as f:
+        json.dump(history, f, indent=1)
+
+    os.replace(tmpPath, path)
+
+
+def getBaseline(history, machine, name, scale, runs):
+    values = []
+    for entry in reversed(history):
+        if entry["machine"] != machine:
+            continue
+
+        result = entry["results"].get(name, {}).get(str(scale))
+        if result:
+            values.append(result["median"])
+
+        if len(values) >= runs:
+            break
+
+    if not values:
+        return None
+
+    values.sort()
+    return values[len(values) // 2]
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--run-case":
+        return runCase(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", default=",".join(caseNames))
+    parser.add_argument("--scales", default="1,10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--history", default=os.path.join(benchDir, "results", "history.json"))
+    parser.add_argument("--baseline-runs", type=int, default=5)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="allowed slowdown against the baseline, 0.5 = 50%%"
+    )
+    parser.add_argument(
+        "--min-delta", type=float, default=2.0, help="slowdowns below this many milliseconds are ignored"
+    )
+    parser.add_argument("--no-save", action="store_true", help="don't add this run to the history")
+    args = parser.parse_args()
+
+    cases = [name for name in args.cases.split(",") if name]
+    unknown = [name for name in cases if name not in caseNames]
+    if unknown:
+        parser.error("unknown cases: %s" % ", ".join(unknown))
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale]
+    history = loadHistory(args.history)
+    machine = getMachine()
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": getCommit(),
+        "machine": machine,
+        "results": {},
+    }
+
+    regressions = []
+    print("%-24s %8s %12s %12s %8s" % ("case", "scale", "median ms", "baseline ms", "change"))
+    for name in cases:
+        entry["results"][name] = {}
+        for scale in scales:
+            result = measure(name, scale, args.repeat)
+            entry["results"][name][str(scale)] = result
+            baseline = getBaseline(history, machine, name, scale, args.baseline_runs)
+            change = ""
+            if baseline:
+                ratio = result["median"] / baseline - 1
+                change = "%+.0f%%" % (ratio * 100)
+                if ratio > args.tolerance and (result["median"] - baseline) * 1000 > args.min_delta:
+                    regressions.append((name, scale, baseline, result["median"]))
+                    change += " !"
+
+            print(
+                "%-24s %8s %12.3f %12s %8s"
+                % (
+                    name,
+                    scale,
+                    result["median"] * 1000,
+                    "%.3f" % (baseline * 1000) if baseline else "-",
+                    change,
+                )
+            )
+
+    if not args.no_save:
+        history.append(entry)
+        saveHistory(args.history, history)
+
+    for name, scale, baseline, median in regressions:
+        print(
+            "REGRESSION: %s at scale %s: %.3fms -> %.3fms" % (name, scale, baseline * 1000, median * 1000)
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Stand-in for a Hiero executable, used by bench_launcher.py. It sleeps
+# for FAKE_HIERO_STARTUP_DELAY seconds to model the application startup,
+# then either opens the project given on the command line or registers
+# in the launcher pool like the Prism plugin does and waits for a project.
+# Opening takes FAKE_HIERO_OPEN_DELAY seconds.
+#
+
+import os
+import sys
+import time
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(benchDir), "Scripts"))
+
+import Prism_Hiero_Launcher
+
+
+def openProject(filepath):
+    time.sleep(float(os.getenv("FAKE_HIERO_OPEN_DELAY", "0.05")))
+    return os.path.exists(filepath)
+
+
+def main():
+    time.sleep(float(os.getenv("FAKE_HIERO_STARTUP_DELAY", "2")))
+    files = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if files:
+        openProject(files[0])
+        return
+
+    thread = Prism_Hiero_Launcher.connectLauncher(openProject)
+    if thread:
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
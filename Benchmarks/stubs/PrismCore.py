@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# Minimal stand-in for Prism's PrismCore, providing the attributes and
+# methods the Hiero plugin uses.
+#
+
+import os
+import atexit
+import shutil
+import tempfile
+
+
+class Paths(object):
+    def __init__(self, core):
+        self.core = core
+
+    def getRenderProductBasePaths(self):
+        paths = {"global": os.path.join(self.core.projectPath, "03_Production")}
+        for idx in range(self.core.extraRenderLocations):
+            paths["location%s" % idx] = os.path.join(self.core.projectPath, "03_Production_%s" % idx)
+
+        return paths
+
+
+class Timer(object):
+    def stop(self):
+        pass
+
+
+class Entities(object):
+    def __init__(self, core):
+        self.core = core
+
+    def splitShotname(self, shotName):
+        if shotName and self.core.sequenceSeparator in shotName:
+            seqName, shotName = shotName.split(self.core.sequenceSeparator, 1)
+        else:
+            seqName = "no sequence"
+
+        return shotName, seqName
+
+    def createEntity(self, entity, entityName, dialog=None, frameRange=None, silent=False):
+        entityPath = self.core.getEntityPath(entity=entity, shot=entityName, asset=entityName)
+        existed = os.path.exists(entityPath)
+        for folder in ["Scenefiles", "Export", "Playblasts", "Rendering"]:
+            path = os.path.join(entityPath, folder)
+            if not os.path.exists(path):
+                os.makedirs(path)
+
+        if not existed:
+            for function in self.core.callbacks.get("on%sCreated" % entity.capitalize(), []):
+                function(self, entityName)
+
+        return {"entity": entity, "entityName": entityName, "entityPath": entityPath, "existed": existed}
+
+
+class PrismCore(object):
+    def __init__(self, app="Standalone", prismArgs=None, projectPath=None):
+        self.appPlugin = None
+        self.app = app
+        self.prismArgs = prismArgs or []
+        self.version = "v1.3.0.0"
+        self.uiAvailable = "noUI" not in self.prismArgs
+        self.useOnTop = False
+        self.messageParent = None
+        self.prismRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if not projectPath:
+            projectPath = tempfile.mkdtemp(prefix="prismBench_")
+            atexit.register(shutil.rmtree, projectPath, True)
+
+        self.projectPath = projectPath
+        self.prismIni = os.path.join(self.projectPath, "00_Pipeline", "pipeline.yml")
+        self.userini = os.path.join(self.projectPath, "Prism.yml")
+        self.config = {}
+        self.callbacks = {}
+        self.sequenceSeparator = "-"
+        self.extraRenderLocations = 0
+        self.timer = Timer()
+        self.paths = Paths(self)
+        self.entities = Entities(self)
+
+        if self.app == "Hiero":
+            import Prism_Hiero_init
+
+            self.appPlugin = Prism_Hiero_init.Prism_Plugin_Hiero(self)
+            self.appPlugin.startup(self)
+
+    def projectBrowser(self):
+        pass
+
+    def saveScene(self, *args, **kwargs):
+        pass
+
+    def saveWithComment(self):
+        pass
+
+    def prismSettings(self):
+        pass
+
+    def registerCallback(self, name, function, plugin=None):
+        self.callbacks.setdefault(name, []).append(function)
+
+    def getConfig(self, cat=None, param=None, config=None, configPath=None):
+        data = self.config.get(cat, {}) if cat else self.config
+        if param:
+            return data.get(param)
+
+        return data
+
+    def setConfig(self, cat=None, param=None, val=None, config=None, configPath=None):
+        if param is None:
+            self.config[cat] = val
+        else:
+            self.config.setdefault(cat, {})[param] = val
+
+    def getEntityPath(self, entity=None, asset=None, shot=None):
+        return os.path.join(self.projectPath, "02_Shots" if entity == "shot" else "01_Assets", shot or asset)
+
+    def fixPath(self, path):
+        return path.replace("\\", "/")
+
+    def sceneOpen(self, *args, **kwargs):
+        if self.appPlugin:
+            self.appPlugin.sceneOpen(self)
+
+    def popupQuestion(self, text, title=None, buttons=None, default=None, **kwargs):
+        return default or (buttons or ["Yes"])[0]
+
+    def popup(self, text, title=None, severity="warning", **kwargs):
+        print("%s: %s" % (severity, text))
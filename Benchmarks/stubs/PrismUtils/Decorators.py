@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#
+# Stub of the Prism decorators. Errors are raised instead of being shown in
+# a dialog.
+#
+
+import functools
+
+
+def err_catcher(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+err_catcher_plugin = err_catcher
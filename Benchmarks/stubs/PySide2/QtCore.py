@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+
+class Qt(object):
+    Window = 0x00000001
+    WindowStaysOnTopHint = 0x00040000
+    SmoothTransformation = 1
+    DisplayRole = 0
+    ToolTipRole = 3
+    UserRole = 0x0100
+
+
+class Signal(object):
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class QMetaObject(object):
+    def __init__(self, className):
+        self._className = className
+
+    def className(self):
+        return self._className
+
+
+class QObject(object):
+    def __init__(self, parent=None):
+        self._children = []
+        self._parent = None
+        self._deleted = False
+        self._className = type(self).__name__
+        if parent is not None:
+            self.setParent(parent)
+
+    def parent(self):
+        return self._parent
+
+    def setParent(self, parent, flags=None):
+        if self._parent is not None and self in self._parent._children:
+            self._parent._children.remove(self)
+
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+
+    def children(self):
+        return list(self._children)
+
+    def inherits(self, className):
+        return any(cls.__name__ == className for cls in type(self).__mro__)
+
+    def metaObject(self):
+        if self._deleted:
+            raise RuntimeError("Internal C++ object (%s) already deleted." % self._className)
+
+        return QMetaObject(self._className)
+
+    def deleteLater(self):
+        self._deleted = True
+        self.setParent(None)
+
+
+class QTimer(QObject):
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.timeout = Signal()
+        self._singleShot = False
+        self._interval = 0
+        self._active = False
+
+    @staticmethod
+    def singleShot(msec, func):
+        func()
+
+    def setSingleShot(self, singleShot):
+        self._singleShot = singleShot
+
+    def setInterval(self, msec):
+        self._interval = msec
+
+    def start(self, msec=None):
+        if msec is not None:
+            self._interval = msec
+
+        self._active = True
+
+    def stop(self):
+        self._active = False
+
+    def isActive(self):
+        return self._active
+
+
+class QPersistentModelIndex(object):
+    def __init__(self, index):
+        self._index = index
+
+    def isValid(self):
+        return self._index.isValid()
+
+    def model(self):
+        return self._index.model()
+
+    def row(self):
+        return self._index.row()
+
+    def column(self):
+        return self._index.column()
+
+    def parent(self):
+        return self._index.parent()
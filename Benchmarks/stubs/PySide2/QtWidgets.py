@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+from .QtCore import QObject, Signal
+
+
+class QApplication(object):
+    _topLevelWidgets = []
+
+    @staticmethod
+    def topLevelWidgets():
+        return [widget for widget in QApplication._topLevelWidgets if not widget._deleted]
+
+    @staticmethod
+    def instance():
+        return None
+
+
+class QWidget(QObject):
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._windowFlags = 0
+
+    def windowFlags(self):
+        return self._windowFlags
+
+    def setWindowFlags(self, flags):
+        self._windowFlags = flags
+
+    def setParent(self, parent, flags=None):
+        QObject.setParent(self, parent)
+        if flags is not None:
+            self._windowFlags = flags
+
+
+class QMainWindow(QWidget):
+    def __init__(self, parent=None, className=None):
+        QWidget.__init__(self, parent)
+        if className:
+            self._className = className
+
+
+class QAction(QObject):
+    def __init__(self, text, parent=None):
+        QObject.__init__(self, parent)
+        self._text = text
+        self.triggered = Signal()
+
+    def text(self):
+        return self._text
+
+
+class QMenu(QWidget):
+    def __init__(self, title="", parent=None):
+        QWidget.__init__(self, parent)
+        self._title = title
+        self._actions = []
+
+    def title(self):
+        return self._title
+
+    def addAction(self, text, callback=None):
+        action = QAction(text, self)
+        if callback is not None:
+            action.triggered.connect(callback)
+
+        self._actions.append(action)
+        return action
+
+    def addSeparator(self):
+        return self.addAction("")
+
+    def actions(self):
+        return list(self._actions)
+
+
+class QMenuBar(QWidget):
+    def addMenu(self, title):
+        return QMenu(title, self)
+
+
+class QMessageBox(object):
+    Ok = 1024
+
+    @staticmethod
+    def warning(parent, title, text, *args):
+        print("%s: %s" % (title, text))
+        return QMessageBox.Ok
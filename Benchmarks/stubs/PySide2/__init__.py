@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+#
+# Stub of PySide2 with the widgets, timers and signals the plugin uses.
+# There is no event loop: single shot timers call their function right
+# away and other timers never fire.
+#
+
+import _stubutils
+
+_stubutils.simulateImportCost()
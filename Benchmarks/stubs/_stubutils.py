@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#
+# Helpers shared by the stub host modules used in the benchmarks.
+#
+
+import os
+import time
+
+
+def simulateImportCost():
+    # lets benchmarks model the import cost of the real host modules
+    delay = float(os.getenv("PRISM_BENCH_IMPORT_DELAY", "0") or 0)
+    if delay:
+        time.sleep(delay)
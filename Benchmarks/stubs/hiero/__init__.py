@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+#
+# Stub of the hiero package for running the plugin outside of Hiero.
+#
+
+import _stubutils
+
+_stubutils.simulateImportCost()
+
+from . import core
+from . import ui
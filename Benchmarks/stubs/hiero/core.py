@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+import os
+import uuid
+
+
+class Event(object):
+    def __init__(self, eventType, **kwargs):
+        self.type = eventType
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class Project(object):
+    def __init__(self, path):
+        self._path = path
+        self._sequences = []
+        self._clipsBin = Bin("Clips")
+        self._undoCount = 0
+
+    def path(self):
+        return self._path
+
+    def name(self):
+        return os.path.splitext(os.path.basename(self._path))[0]
+
+    def sequences(self):
+        return tuple(self._sequences)
+
+    def addSequence(self, sequence):
+        sequence._project = self
+        self._sequences.append(sequence)
+        self._undoCount += 1
+        return sequence
+
+    def clipsBin(self):
+        return self._clipsBin
+
+    def undoItem(self):
+        return "edit %s" % self._undoCount
+
+    def toXml(self):
+        lines = ['<hieroXML release="13.2v3" name="%s">' % escape(self.name()), "<Project>"]
+        for clip in iterClips(self._clipsBin):
+            lines.append('<Clip name="%s">' % escape(clip.name()))
+            for fileInfo in clip.mediaSource().fileinfos():
+                lines.append('<MediaSource file="%s"/>' % escape(fileInfo.filename()))
+
+            lines.append("</Clip>")
+
+        for sequence in self._sequences:
+            lines.append('<Sequence name="%s"><framerate>25</framerate>' % escape(sequence.name()))
+            for track in sequence.videoTracks():
+                lines.append('<VideoTrack name="%s">' % escape(track.name()))
+                for item in track.items():
+                    lines.append(
+                        '<TrackItem name="%s" timelineIn="%s" timelineOut="%s" sourceIn="%s" sourceOut="%s"/>'
+                        % (escape(item.name()), item.timelineIn(), item.timelineOut(), item.sourceIn(), item.sourceOut())
+                    )
+
+                lines.append("</VideoTrack>")
+
+            lines.append("</Sequence>")
+
+        lines += ["</Project>", "</hieroXML>"]
+        return "\n".join(lines)
+
+    def saveAs(self, path):
+        events.sendEvent("kBeforeProjectSave", Event("kBeforeProjectSave", project=self))
+        with open(path, "w") as f:
+            f.write(self.toXml())
+
+        self._path = path
+        events.sendEvent("kAfterProjectSave", Event("kAfterProjectSave", project=self))
+        return True
+
+    def save(self):
+        return self.saveAs(self._path)
+
+    def close(self):
+        if self in _projects:
+            events.sendEvent("kBeforeProjectClose", Event("kBeforeProjectClose", project=self))
+            _projects.remove(self)
+            events.sendEvent("kAfterProjectClose", Event("kAfterProjectClose", project=self))
+
+
+class FileInfo(object):
+    def __init__(self, filename, startFrame=1, endFrame=1):
+        self._filename = filename
+        self._startFrame = startFrame
+        self._endFrame = endFrame
+
+    def filename(self):
+        return self._filename
+
+    def startFrame(self):
+        return self._startFrame
+
+    def endFrame(self):
+        return self._endFrame
+
+
+class MediaSource(object):
+    def __init__(self, fileInfos):
+        self._fileInfos = fileInfos
+
+    def fileinfos(self):
+        return list(self._fileInfos)
+
+
+class Bin(object):
+    def __init__(self, name):
+        self._name = name
+        self._items = []
+
+    def name(self):
+        return self._name
+
+    def items(self):
+        return tuple(self._items)
+
+    def addItem(self, item):
+        self._items.append(item)
+        return item
+
+
+class BinItem(object):
+    def __init__(self, activeItem):
+        self._activeItem = activeItem
+
+    def activeItem(self):
+        return self._activeItem
+
+
+def iterClips(binObj):
+    for item in binObj.items():
+        if isinstance(item, Bin):
+            for clip in iterClips(item):
+                yield clip
+        elif isinstance(item, BinItem):
+            yield item.activeItem()
+
+
+def escape(text):
+    return str(text).replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+
+
+class Clip(object):
+    def __init__(self, name, fileInfos=None):
+        self._name = name
+        self._mediaSource = MediaSource(fileInfos or [])
+
+    def name(self):
+        return self._name
+
+    def mediaSource(self):
+        return self._mediaSource
+
+
+class TrackItem(object):
+    def __init__(self, name, timelineIn, timelineOut, sourceIn=None, sourceOut=None):
+        self._guid = "{%s}" % uuid.uuid4()
+        self._name = name
+        self._timelineIn = timelineIn
+        self._timelineOut = timelineOut
+        self._sourceIn = timelineIn if sourceIn is None else sourceIn
+        self._sourceOut = timelineOut if sourceOut is None else sourceOut
+        self._source = Clip(name)
+        self._track = None
+
+    def guid(self):
+        return self._guid
+
+    def name(self):
+        return self._name
+
+    def setName(self, name):
+        self._name = name
+
+    def timelineIn(self):
+        return self._timelineIn
+
+    def timelineOut(self):
+        return self._timelineOut
+
+    def setTimes(self, timelineIn, timelineOut, sourceIn, sourceOut):
+        self._timelineIn = timelineIn
+        self._timelineOut = timelineOut
+        self._sourceIn = sourceIn
+        self._sourceOut = sourceOut
+
+    def sourceIn(self):
+        return self._sourceIn
+
+    def sourceOut(self):
+        return self._sourceOut
+
+    def source(self):
+        return self._source
+
+    def parentTrack(self):
+        return self._track
+
+    def parentSequence(self):
+        return self._track.parent()
+
+    def project(self):
+        return self.parentSequence().project()
+
+
+class VideoTrack(object):
+    def __init__(self, name):
+        self._guid = "{%s}" % uuid.uuid4()
+        self._name = name
+        self._items = []
+        self._sequence = None
+
+    def guid(self):
+        return self._guid
+
+    def name(self):
+        return self._name
+
+    def items(self):
+        return tuple(self._items)
+
+    def addItem(self, item):
+        item._track = self
+        self._items.append(item)
+        return item
+
+    def removeItem(self, item):
+        self._items.remove(item)
+
+    def parent(self):
+        return self._sequence
+
+
+class Sequence(object):
+    def __init__(self, name):
+        self._guid = "{%s}" % uuid.uuid4()
+        self._name = name
+        self._tracks = []
+        self._project = None
+
+    def guid(self):
+        return self._guid
+
+    def name(self):
+        return self._name
+
+    def videoTracks(self):
+        return tuple(self._tracks)
+
+    def addTrack(self, track):
+        track._sequence = self
+        self._tracks.append(track)
+        return track
+
+    def project(self):
+        return self._project
+
+
+class TaskPresetBase(object):
+    def addUserResolveEntries(self, resolver):
+        pass
+
+
+class TaskRegistry(object):
+    def createAndExecuteProcessor(self, preset, items, synchronous=False):
+        return {"preset": preset, "items": list(items)}
+
+
+class Events(object):
+    def __init__(self):
+        self.handlers = {}
+
+    def registerInterest(self, eventType, handler):
+        self.handlers.setdefault(eventType, []).append(handler)
+
+    def unregisterInterest(self, eventType, handler):
+        if handler in self.handlers.get(eventType, []):
+            self.handlers[eventType].remove(handler)
+
+    def sendEvent(self, eventType, event=None):
+        for handler in list(self.handlers.get(eventType, [])):
+            handler(event)
+
+
+_projects = []
+taskRegistry = TaskRegistry()
+events = Events()
+
+
+def projects():
+    return tuple(_projects)
+
+
+def openProject(path):
+    events.sendEvent("kBeforeProjectLoad", Event("kBeforeProjectLoad"))
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            f.read()
+
+    project = Project(path)
+    _projects.append(project)
+    events.sendEvent("kAfterProjectLoad", Event("kAfterProjectLoad", project=project))
+    return project
+
+
+def newProject(name="Untitled"):
+    project = Project(name)
+    _projects.append(project)
+    events.sendEvent("kAfterNewProjectCreated", Event("kAfterNewProjectCreated", project=project))
+    return project
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+_activeSequence = None
+_menuBar = None
+
+# simulated cost of a call into the Hiero UI API in seconds
+callDelay = 0.0
+
+
+def simulateCallCost():
+    if callDelay:
+        end = time.time() + callDelay
+        while time.time() < end:
+            pass
+
+
+def activeSequence():
+    simulateCallCost()
+    return _activeSequence
+
+
+def menuBar():
+    # imported here, headless sessions must not load the UI modules
+    global _menuBar
+    from PySide2 import QtWidgets
+
+    if _menuBar is None:
+        _menuBar = QtWidgets.QMenuBar()
+        for title in ["File", "Edit", "View", "Timeline", "Window", "Help"]:
+            _menuBar.addMenu(title)
+
+    return _menuBar
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+#
+# Stub of the nuke module for running the plugin outside of Nuke.
+#
+
+import _stubutils
+
+_stubutils.simulateImportCost()
+
+NUKE_VERSION_STRING = "13.2v3"
+env = {"studio": False, "hiero": True, "gui": False}
+
+scriptLoadCallbacks = []
+pluginPaths = []
+
+
+def addOnScriptLoad(callback, *args, **kwargs):
+    scriptLoadCallbacks.append(callback)
+
+
+def pluginAddPath(path):
+    pluginPaths.append(path)
+
+
+def message(text):
+    print(text)
+
+
+def executeInMainThread(call, args=(), kwargs={}):
+    return call(*args, **kwargs)
@@ -6,7 +6,6 @@
 #
 ####################################################
 
-from . import hiero_init
 from . import hiero_init
 from . import hiero_menu
 
@@ -16,14 +16,6 @@ if (nuke.env["studio"] or nuke.env["hiero"]) and (not nuke.env.get("gui")):
         import os
         import sys
 
-        try:
-            from PySide2.QtCore import *
-            from PySide2.QtGui import *
-            from PySide2.QtWidgets import *
-        except:
-            from PySide.QtCore import *
-            from PySide.QtGui import *
-
         prismRoot = os.getenv("PRISM_ROOT")
         if not prismRoot:
             prismRoot = PRISMROOT
@@ -32,16 +24,11 @@ if (nuke.env["studio"] or nuke.env["hiero"]) and (not nuke.env.get("gui")):
         if scriptDir not in sys.path:
             sys.path.append(scriptDir)
 
-        qapp = QApplication.instance()
-        if not qapp:
-            qapp = QApplication(sys.argv)
-
-        if isinstance(qapp, QCoreApplication):
-            print("a QCoreApplication exists. failed to load Prism")
-        else:
-            print(qapp)
-            import PrismCore
+        # headless sessions (farm, batch exports) don't need a QApplication,
+        # the plugin only sets up what's needed to resolve paths and save projects
+        import PrismCore
 
-            pcore = PrismCore.PrismCore(app="Hiero", prismArgs=["noUI"])
+        pcore = PrismCore.PrismCore(app="Hiero", prismArgs=["noUI"])
+        hiero.pcore = pcore
 
 # <<<PrismEnd
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+import collections
+
+from Prism_Hiero_Lazy import nuke, hiero, QtCore
+from Prism_Hiero_Utils import getCacheDir
+
+
+logger = logging.getLogger(__name__)
+
+
+def getAutobackDir():
+    return getCacheDir("autoback")
+
+
+class Prism_Hiero_Autosave(object):
+    """Keeps a rotating history of autosaves of the current project with a
+    bounded cost for the editor.
+
+    The project itself is never saved here, as saving it to another path
+    would move it there and mark its changes as saved. Instead the autosave
+    file Hiero writes next to the project (<project>.autosave) is collected
+    whenever it is newer than the project and the last collected autosave.
+    A check runs every interval seconds and only copies after no Hiero
+    activity was seen for idleTime seconds and playback is stopped,
+    otherwise it retries shortly after. The copy into the autoback folder
+    happens on a worker thread and the interval grows with the measured
+    copy time, so collecting autosaves never takes more than costRatio of
+    the session.
+
+    The autosaves of each project, meaning all versions in one scene
+    folder, are kept in their own subfolder and rotated separately, so a
+    busy project can't push out the history of the others. If Hiero's
+    project autosave is disabled in its preferences, or no autosave
+    appears for missingTime seconds after an edit, a warning is logged
+    once per session."""
+
+    activityEvents = [
+        "kSelectionChanged",
+        "kPlaybackClipChanged",
+        "kPlaybackSrcChanged",
+    ]
+    editEvents = ["kSequenceEdited"]
+    # knobs of the preferences node with Hiero's project autosave interval
+    preferenceKnobs = ["AutoSaveProjectTime", "autoSaveProjectTime"]
+    autosaveSuffix = ".autosave"
+
+    def __init__(
+        self,
+        plugin,
+        autobackDir=None,
+        interval=300,
+        maxInterval=1800,
+        idleTime=2.0,
+        costRatio=0.02,
+        maxFiles=10,
+        maxSize=500 * 1024 * 1024,
+        missingTime=1800,
+    ):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.autobackDir = autobackDir
+        self.interval = interval
+        self.maxInterval = maxInterval
+        self.idleTime = idleTime
+        self.costRatio = costRatio
+        self.maxFiles = maxFiles
+        self.maxSize = maxSize
+        self.missingTime = missingTime
+        self.timer = None
+        self.executor = None
+        self.playing = False
+        self.lastActivity = 0
+        self.lastEdit = None
+        self.warned = False
+        self.collected = {}
+        self.durations = collections.deque(maxlen=10)
+        self.stats = {"saves": 0, "skipped": 0, "postponed": 0, "failed": 0}
+
+    def register(self):
+        for eventType in self.activityEvents:
+            hiero.core.events.registerInterest(eventType, self.onActivity)
+
+        for eventType in self.editEvents:
+            hiero.core.events.registerInterest(eventType, self.onEdit)
+
+        hiero.core.events.registerInterest("kPlaybackStarted", self.onPlaybackStarted)
+        hiero.core.events.registerInterest("kPlaybackStopped", self.onPlaybackStopped)
+
+    def start(self):
+        try:
+            self.register()
+        except Exception as e:
+            logger.debug("failed to register the autosave events: %s" % e)
+
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+        self.schedule(self.getInterval())
+
+    def stop(self):
+        if self.timer:
+            self.timer.stop()
+
+    def schedule(self, delay):
+        self.timer.start(int(delay * 1000))
+
+    def onActivity(self, event=None):
+        self.lastActivity = time.time()
+
+    def onEdit(self, event=None):
+        self.lastActivity = self.lastEdit = time.time()
+
+    def onPlaybackStarted(self, event=None):
+        self.playing = True
+
+    def onPlaybackStopped(self, event=None):
+        self.playing = False
+        self.lastActivity = time.time()
+
+    def getInterval(self):
+        interval = self.plugin.settings.get("autosaveinterval")
+        interval = interval * 60 if interval else self.interval
+        if self.durations:
+            interval = max(interval, max(self.durations) / self.costRatio)
+
+        return min(interval, self.maxInterval)
+
+    def tick(self):
+        if not self.plugin.settings.get("autosave"):
+            self.schedule(self.getInterval())
+            return
+
+        if self.playing or time.time() - self.lastActivity < self.idleTime:
+            self.stats["postponed"] += 1
+            self.schedule(self.idleTime)
+            return
+
+        if self.plugin.asyncSave.queue.unfinished_tasks:
+            self.stats["postponed"] += 1
+            self.schedule(self.idleTime)
+            return
+
+        try:
+            self.save()
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning("autosave failed: %s" % e)
+
+        self.schedule(self.getInterval())
+
+    def getAutosaveSource(self, project):
+        """Returns the path and mtime of Hiero's autosave of the project if
+        it holds changes which weren't collected yet, otherwise None."""
+        projectPath = project.path()
+        if not projectPath:
+            return None
+
+        sourcePath = projectPath + self.autosaveSuffix
+        try:
+            mtime = os.path.getmtime(sourcePath)
+        except OSError:
+            return None
+
+        try:
+            if mtime <= os.path.getmtime(projectPath):
+                return None
+        except OSError:
+            pass
+
+        if mtime <= self.collected.get(sourcePath, 0):
+            return None
+
+        return sourcePath, mtime
+
+    def save(self):
+        project = self.plugin.getActiveProject()
+        filepath = self.plugin.getCurrentFileName(self.core)
+        source = self.getAutosaveSource(project) if project and filepath else None
+        if not source:
+            if project:
+                self.checkHieroAutosave(project)
+
+            self.stats["skipped"] += 1
+            return False
+
+        sourcePath, mtime = source
+        self.collected[sourcePath] = mtime
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.executor.submit(self.write, sourcePath, self.getAutobackPath(filepath), mtime)
+        self.stats["saves"] += 1
+        return True
+
+    def isHieroAutosaveEnabled(self):
+        """Returns whether Hiero's preferences enable the project autosave,
+        or None if the preference can't be read."""
+        try:
+            preferences = nuke.toNode("preferences")
+        except Exception:
+            return None
+
+        if preferences is None:
+            return None
+
+        for name in self.preferenceKnobs:
+            knob = preferences.knob(name)
+            if knob is not None:
+                return knob.value() > 0
+
+        return None
+
+    def checkHieroAutosave(self, project):
+        if self.warned:
+            return
+
+        enabled = self.isHieroAutosaveEnabled()
+        if enabled is None and self.lastEdit and time.time() - self.lastEdit > self.missingTime:
+            # the preference is unknown, so go by the autosaves Hiero writes
+            try:
+                mtime = os.path.getmtime(project.path() + self.autosaveSuffix)
+            except OSError:
+                mtime = 0
+
+            enabled = mtime >= self.lastEdit
+
+        if enabled is False:
+            self.warned = True
+            logger.warning(
+                "Hiero doesn't autosave the project, so Prism keeps no autosave history of it. "
+                "Enable the project autosave in Hiero's preferences."
+            )
+
+    def getProjectAutobackDir(self, filepath):
+        if not self.autobackDir:
+            self.autobackDir = getAutobackDir()
+
+        sceneDir = os.path.dirname(os.path.normcase(os.path.abspath(filepath)))
+        key = hashlib.md5(sceneDir.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.autobackDir, "%s_%s" % (os.path.basename(sceneDir), key))
+
+    def getAutobackPath(self, filepath):
+        base, ext = os.path.splitext(os.path.basename(filepath))
+        return os.path.join(
+            self.getProjectAutobackDir(filepath),
+            "%s_autosave_%s%s" % (base, time.strftime("%Y%m%d_%H%M%S"), ext),
+        )
+
+    def write(self, sourcePath, autobackPath, mtime):
+        start = time.time()
+        partPath = autobackPath + ".part"
+        try:
+            if not os.path.exists(os.path.dirname(autobackPath)):
+                os.makedirs(os.path.dirname(autobackPath))
+
+            shutil.copyfile(sourcePath, partPath)
+            if os.path.getmtime(sourcePath) != mtime:
+                # Hiero wrote a new autosave during the copy, the next tick collects it
+                os.remove(partPath)
+                self.collected.pop(sourcePath, None)
+                return
+
+            os.replace(partPath, autobackPath)
+        except (IOError, OSError) as e:
+            self.stats["failed"] += 1
+            logger.warning("failed to write the autosave %s: %s" % (autobackPath, e))
+            return
+
+        self.durations.append(time.time() - start)
+        self.rotate(os.path.dirname(autobackPath))
+
+    def rotate(self, folder):
+        files = []
+        for entry in os.listdir(folder):
+            path = os.path.join(folder, entry)
+            if "_autosave_" not in entry or entry.endswith(".part"):
+                continue
+
+            try:
+                fileStat = os.stat(path)
+            except OSError:
+                continue
+
+            files.append((fileStat.st_mtime, fileStat.st_size, path))
+
+        total = 0
+        for idx, (mtime, size, path) in enumerate(sorted(files, reverse=True)):
+            total += size
+            if idx < self.maxFiles and (idx == 0 or total <= self.maxSize):
+                continue
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def getStats(self):
+        stats = dict(self.stats)
+        stats["interval"] = self.getInterval()
+        stats["lastDuration"] = self.durations[-1] if self.durations else None
+        return stats
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import json
+import zlib
+import bisect
+import hashlib
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Delta versions are only readable by this plugin. Hiero itself can't open
+# them, so every code path which hands a version to Hiero has to rebuild it
+# with rebuildFile first (see Prism_Hiero_Save.rebuildVersion). Opening a
+# delta .hrox directly from the file system or with a plain Hiero launch
+# fails.
+magic = b"PRISMHIERODELTA1\n"
+
+
+class DeltaError(Exception):
+    pass
+
+
+def isDeltaFile(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(magic)) == magic
+    except (IOError, OSError):
+        return False
+
+
+def readHeader(path):
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            return None
+
+        return json.loads(f.readline().decode("utf-8"))
+
+
+def createDelta(baseData, newData):
+    """Returns the operations to rebuild newData from the lines of baseData
+    and the literal data they reference. Lines are matched greedily, which
+    is linear in the size of the files and works well for the localized
+    edits between two versions of a project."""
+    baseLines = baseData.splitlines(True)
+    occurrences = {}
+    for idx, line in enumerate(baseLines):
+        occurrences.setdefault(line, []).append(idx)
+
+    ops = []
+    literals = []
+    literalSize = 0
+    pos = 0
+    for line in newData.splitlines(True):
+        if pos < len(baseLines) and baseLines[pos] == line:
+            idx = pos
+        elif pos + 1 < len(baseLines) and baseLines[pos + 1] == line:
+            idx = pos + 1
+        else:
+            idx = None
+            lineOccurrences = occurrences.get(line)
+            if lineOccurrences:
+                occurrence = bisect.bisect_left(lineOccurrences, pos)
+                if occurrence == len(lineOccurrences):
+                    occurrence = 0
+
+                idx = lineOccurrences[occurrence]
+
+        if idx is None:
+            if ops and ops[-1][0] == "i":
+                ops[-1][2] += len(line)
+            else:
+                ops.append(["i", literalSize, len(line)])
+
+            literals.append(line)
+            literalSize += len(line)
+            pos += 1
+        else:
+            if ops and ops[-1][0] == "c" and ops[-1][1] + ops[-1][2] == idx:
+                ops[-1][2] += 1
+            else:
+                ops.append(["c", idx, 1])
+
+            pos = idx + 1
+
+    return ops, b"".join(literals)
+
+
+def applyDelta(baseData, ops, literals):
+    baseLines = baseData.splitlines(True)
+    result = []
+    for op, start, length in ops:
+        if op == "c":
+            result.extend(baseLines[start:start + length])
+        else:
+            result.append(literals[start:start + length])
+
+    return b"".join(result)
+
+
+def readFile(path, maxDepth=100):
+    """Returns the full content of a project file, resolving delta chains."""
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            f.seek(0)
+            return f.read()
+
+        header = json.loads(f.readline().decode("utf-8"))
+        payload = zlib.decompress(f.read())
+
+    if maxDepth <= 0:
+        raise DeltaError("Delta chain is too long: %s" % path)
+
+    basePath = os.path.join(os.path.dirname(path), header["base"])
+    if not os.path.exists(basePath):
+        raise DeltaError("The base version of %s doesn't exist: %s" % (path, basePath))
+
+    baseData = readFile(basePath, maxDepth=maxDepth - 1)
+    opsData, literals = payload.split(b"\n", 1)
+    data = applyDelta(baseData, json.loads(opsData.decode("utf-8")), literals)
+    if hashlib.sha1(data).hexdigest() != header["sha1"]:
+        raise DeltaError(
+            "The rebuilt content of %s doesn't match, its base version %s has changed."
+            % (path, basePath)
+        )
+
+    return data
+
+
+def rebuildFile(path, targetPath):
+    data = readFile(path)
+    targetDir = os.path.dirname(targetPath)
+    if targetDir and not os.path.exists(targetDir):
+        os.makedirs(targetDir)
+
+    tmpPath = targetPath + ".part"
+    with open(tmpPath, "wb") as f:
+        f.write(data)
+
+    os.replace(tmpPath, targetPath)
+    return len(data)
+
+
+def isRebuilt(path, targetPath):
+    """Returns whether targetPath already holds the rebuilt content of the
+    delta file at path."""
+    header = readHeader(path)
+    if header is None:
+        return False
+
+    try:
+        return (
+            os.path.getsize(targetPath) == header["size"]
+            and os.path.getmtime(targetPath) >= os.path.getmtime(path)
+        )
+    except OSError:
+        return False
+
+
+def getDepth(path):
+    header = readHeader(path)
+    if header is None:
+        return 0
+
+    return header.get("depth", 0)
+
+
+def writeFull(path, data):
+    partPath = path + ".part"
+    with open(partPath, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(partPath, path)
+    return len(data)
+
+
+def protectDependents(path):
+    """Converts deltas which are based on path into full files, so that
+    overwriting path doesn't break them."""
+    folder = os.path.dirname(path)
+    name = os.path.basename(path)
+    ext = os.path.splitext(path)[1]
+    for filename in os.listdir(folder):
+        if filename == name or os.path.splitext(filename)[1] != ext:
+            continue
+
+        dependent = os.path.join(folder, filename)
+        try:
+            header = readHeader(dependent)
+        except (IOError, OSError, ValueError):
+            continue
+
+        if header and header.get("base") == name:
+            logger.debug("converting %s to a full version before %s gets overwritten" % (dependent, path))
+            writeFull(dependent, readFile(dependent))
+
+
+def writeVersion(path, data, basePath=None, baseData=None, keyframeInterval=10, maxRatio=0.5):
+    """Writes data to path, either as a delta against basePath or as a full
+    file if there is no usable base, the delta chain reached the keyframe
+    interval or the delta wouldn't save enough. baseData can be passed if
+    the full content of basePath is already known. Returns the type of file
+    written and the number of bytes."""
+    if os.path.exists(path):
+        protectDependents(path)
+
+    kind = "full"
+    content = data
+    if basePath and os.path.exists(basePath) and os.path.dirname(
+        os.path.abspath(basePath)
+    ) == os.path.dirname(os.path.abspath(path)):
+        try:
+            depth = getDepth(basePath) + 1
+            if depth < keyframeInterval:
+                if baseData is None:
+                    baseData = readFile(basePath)
+
+                ops, literals = createDelta(baseData, data)
+                payload = zlib.compress(
+                    json.dumps(ops, separators=(",", ":")).encode("utf-8") + b"\n" + literals
+                )
+                if len(payload) < len(zlib.compress(data, 1)) * maxRatio:
+                    header = {
+                        "base": os.path.basename(basePath),
+                        "sha1": hashlib.sha1(data).hexdigest(),
+                        "size": len(data),
+                        "depth": depth,
+                    }
+                    content = magic + json.dumps(header).encode("utf-8") + b"\n" + payload
+                    kind = "delta"
+        except (DeltaError, IOError, OSError, ValueError, zlib.error) as e:
+            logger.warning("failed to create a delta against %s, saving a full version: %s" % (basePath, e))
+
+    return kind, writeFull(path, content)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import re
+import glob
+import platform
+import logging
+
+from Prism_Hiero_Utils import getCacheDir, readJson, writeJson
+
+
+logger = logging.getLogger(__name__)
+
+folderPattern = re.compile(r"^Nuke(\d+)\.(\d+)v(\d+)$")
+cacheVersion = 1
+
+
+def parseVersion(version):
+    match = re.match(r"^(\d+)\.(\d+)v(\d+)$", version or "")
+    if not match:
+        return None
+
+    return tuple(int(part) for part in match.groups())
+
+
+def getInstallRoots():
+    roots = []
+    envRoots = os.getenv("PRISM_HIERO_INSTALL_ROOTS")
+    if envRoots:
+        roots += [root for root in envRoots.split(os.pathsep) if root]
+
+    if platform.system() == "Windows":
+        for var in ["ProgramW6432", "ProgramFiles", "ProgramFiles(x86)"]:
+            if os.getenv(var):
+                roots.append(os.environ[var])
+
+        roots.append("C:\\Program Files")
+    elif platform.system() == "Darwin":
+        roots.append("/Applications")
+    else:
+        roots += ["/usr/local", "/opt", os.path.expanduser("~/Nuke")]
+
+    uniqueRoots = []
+    for root in roots:
+        if root not in uniqueRoots:
+            uniqueRoots.append(root)
+
+    return uniqueRoots
+
+
+def getExecutableInFolder(folder, version):
+    major, minor, patch = version
+    if platform.system() == "Windows":
+        candidates = [os.path.join(folder, "Nuke%s.%s.exe" % (major, minor))]
+    elif platform.system() == "Darwin":
+        candidates = glob.glob(os.path.join(folder, "*.app", "Contents", "MacOS", "Nuke%s.%s*" % (major, minor)))
+    else:
+        candidates = [os.path.join(folder, "Nuke%s.%s" % (major, minor))]
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+
+
+class Prism_Hiero_ExecutableFinder(object):
+    """Finds Nuke/Hiero executables in the standard Foundry install folders.
+    The result is cached on disk and reused as long as the modification
+    times of the install roots are unchanged."""
+
+    def __init__(self, cacheFile=None, roots=None):
+        self.cacheFile = cacheFile
+        self.roots = roots
+        self.executables = None
+
+    def getCacheFile(self):
+        if not self.cacheFile:
+            self.cacheFile = os.path.join(getCacheDir(), "executables.json")
+
+        return self.cacheFile
+
+    def getRootStates(self):
+        states = {}
+        for root in self.roots or getInstallRoots():
+            try:
+                states[root] = os.path.getmtime(root)
+            except OSError:
+                states[root] = None
+
+        return states
+
+    def scan(self, rootStates):
+        executables = {}
+        for root, mtime in rootStates.items():
+            if mtime is None:
+                continue
+
+            try:
+                folders = os.listdir(root)
+            except OSError:
+                continue
+
+            for folder in folders:
+                match = folderPattern.match(folder)
+                if not match:
+                    continue
+
+                version = tuple(int(part) for part in match.groups())
+                executable = getExecutableInFolder(os.path.join(root, folder), version)
+                if executable:
+                    executables.setdefault("%s.%sv%s" % version, executable)
+
+        return executables
+
+    def getExecutables(self):
+        if self.executables is not None:
+            return self.executables
+
+        rootStates = self.getRootStates()
+        cache = readJson(self.getCacheFile())
+        if (
+            cache
+            and cache.get("version") == cacheVersion
+            and cache.get("roots") == rootStates
+            and all(os.path.exists(path) for path in cache.get("executables", {}).values())
+        ):
+            self.executables = cache["executables"]
+            return self.executables
+
+        self.executables = self.scan(rootStates)
+        try:
+            writeJson(
+                self.getCacheFile(),
+                {"version": cacheVersion, "roots": rootStates, "executables": self.executables},
+            )
+        except (IOError, OSError) as e:
+            logger.debug("failed to write the executable cache: %s" % e)
+
+        return self.executables
+
+    def getExecutable(self, versions=None):
+        """Returns the executable of the first of the given versions which is
+        installed, or of the newest installed version."""
+        executables = self.getExecutables()
+        for version in versions or []:
+            if version in executables:
+                return executables[version]
+
+        installed = sorted(executables, key=parseVersion)
+        if installed:
+            return executables[installed[-1]]
+
+    def invalidate(self):
+        self.executables = None
+        try:
+            os.remove(self.getCacheFile())
+        except OSError:
+            pass
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import re
+import time
+import logging
+
+from Prism_Hiero_Lazy import hiero
+
+
+logger = logging.getLogger(__name__)
+
+tokenPattern = re.compile(r"\{([^{}]+)\}")
+
+
+class Prism_Hiero_BatchExport(object):
+    """Resolves and prepares the output folders of a shot export before it
+    is handed to Hiero, so the export tasks don't create them one by one."""
+
+    def __init__(self, plugin, threads=None):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.threads = threads or min(32, (os.cpu_count() or 1) * 4)
+        self.timings = {}
+
+    def getItemTokens(self, item):
+        tokens = {}
+        getters = {
+            "shot": lambda: item.name(),
+            "clip": lambda: item.source().name(),
+            "track": lambda: item.parentTrack().name(),
+            "sequence": lambda: item.parentSequence().name(),
+            "project": lambda: item.project().name(),
+            "projectroot": lambda: item.project().exportRootDirectory(),
+        }
+        for token, getter in getters.items():
+            try:
+                tokens[token] = getter()
+            except Exception:
+                pass
+
+        context = self.plugin.getShotContext(item)
+        if context:
+            tokens["prism_sequence"] = context["sequence"]
+            tokens["prism_shot"] = context["shot"]
+
+        return tokens
+
+    def getTemplatePaths(self, preset):
+        properties = preset.properties()
+        exportRoot = properties.get("exportRoot", "")
+        paths = []
+        for entry in properties.get("exportTemplate", []):
+            path = entry[0]
+            if exportRoot:
+                path = exportRoot.rstrip("/\\") + "/" + path.lstrip("/\\")
+
+            paths.append(path)
+
+        return paths
+
+    def resolvePath(self, path, tokens):
+        def replaceToken(match):
+            return str(tokens.get(match.group(1), match.group(0)))
+
+        return tokenPattern.sub(replaceToken, path)
+
+    def getTargetDirectory(self, resolvedPath):
+        # everything from the first unresolved token on is left to Hiero
+        folders = []
+        for folder in resolvedPath.replace("\\", "/").split("/")[:-1]:
+            if tokenPattern.search(folder):
+                break
+
+            folders.append(folder)
+
+        return "/".join(folders)
+
+    def createDirectory(self, directory):
+        try:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+        except OSError as e:
+            if not os.path.isdir(directory):
+                return directory, str(e)
+
+        if not os.access(directory, os.W_OK):
+            return directory, "Directory is not writable"
+
+        return directory, None
+
+    def prepare(self, preset, items):
+        self.timings = {}
+
+        start = time.time()
+        baseTokens = {}
+        for token, description, path in self.plugin.getRenderPathResolverEntries():
+            baseTokens[token[1:-1]] = path
+
+        itemTokens = []
+        for item in items:
+            tokens = dict(baseTokens)
+            tokens.update(self.getItemTokens(item))
+            itemTokens.append((item, tokens))
+
+        self.timings["collect"] = time.time() - start
+
+        start = time.time()
+        templatePaths = self.getTemplatePaths(preset)
+        itemDirectories = []
+        directories = set()
+        for item, tokens in itemTokens:
+            dirs = set()
+            for templatePath in templatePaths:
+                directory = self.getTargetDirectory(self.resolvePath(templatePath, tokens))
+                if directory:
+                    dirs.add(directory)
+
+            itemDirectories.append((item, dirs))
+            directories.update(dirs)
+
+        self.timings["resolve"] = time.time() - start
+
+        start = time.time()
+        failed = {}
+        if directories:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=self.threads) as executor:
+                for directory, error in executor.map(self.createDirectory, sorted(directories)):
+                    if error:
+                        failed[directory] = error
+
+        self.timings["create"] = time.time() - start
+
+        validItems = []
+        skippedItems = []
+        for item, dirs in itemDirectories:
+            if dirs.intersection(failed):
+                skippedItems.append(item)
+            else:
+                validItems.append(item)
+
+        result = {
+            "items": validItems,
+            "skippedItems": skippedItems,
+            "directories": len(directories),
+            "failed": failed,
+            "timings": self.timings,
+        }
+        return result
+
+    def execute(self, preset, items, synchronous=False):
+        result = self.prepare(preset, items)
+
+        start = time.time()
+        if result["items"]:
+            result["processor"] = hiero.core.taskRegistry.createAndExecuteProcessor(
+                preset, result["items"], synchronous=synchronous
+            )
+        else:
+            result["processor"] = None
+
+        self.timings["submit"] = time.time() - start
+
+        logger.debug(
+            "batch export: %s items, %s directories, %s failed, timings: %s"
+            % (
+                len(result["items"]),
+                result["directories"],
+                len(result["failed"]),
+                ", ".join("%s %.3fs" % (k, v) for k, v in self.timings.items()),
+            )
+        )
+        for directory in sorted(result["failed"]):
+            logger.warning(
+                "failed to prepare export directory %s: %s"
+                % (directory, result["failed"][directory])
+            )
+
+        return result
@@ -38,23 +38,25 @@
 
 import os
 import sys
+import time
 import platform
 import random
 import logging
-
-import nuke
-import hiero
-
-try:
-    from PySide2.QtCore import *
-    from PySide2.QtGui import *
-    from PySide2.QtWidgets import *
-except:
-    from PySide.QtCore import *
-    from PySide.QtGui import *
+import functools
 
 from PrismUtils.Decorators import err_catcher as err_catcher
 
+from Prism_Hiero_Lazy import nuke, hiero, QtCore, QtWidgets, LazyAttribute
+from Prism_Hiero_Profiler import profiled
+from Prism_Hiero_Export import Prism_Hiero_BatchExport
+from Prism_Hiero_Projects import Prism_Hiero_ProjectIndex
+from Prism_Hiero_Media import Prism_Hiero_MediaValidator, collectMediaPaths
+from Prism_Hiero_Pipeline import Prism_Hiero_OpenPipeline
+from Prism_Hiero_Tracker import Prism_Hiero_CurrentFileTracker
+from Prism_Hiero_Shots import Prism_Hiero_ShotIndex
+from Prism_Hiero_ShotCreation import Prism_Hiero_ShotCreator
+from Prism_Hiero_Host import hostLocator
+
 
 logger = logging.getLogger(__name__)
 
@@ -66,38 +68,98 @@ class Prism_Hiero_Functions(object):
 
         self.isRendering = {}
         self.useLastVersion = False
+        self.renderPathCache = {}
+        self.renderPathCacheStats = {"hits": 0, "misses": 0}
+        self.projectIndex = Prism_Hiero_ProjectIndex()
+        self.mediaValidator = None
+        self.inPrismSceneOpen = False
+        self.openPipeline = Prism_Hiero_OpenPipeline()
+        self.currentFileTracker = Prism_Hiero_CurrentFileTracker(self.resolveCurrentFileName)
+        self.shotIndex = Prism_Hiero_ShotIndex(self.parseShotName)
+        self.lastTimelineSync = None
+        self.hostLocator = hostLocator
+        self.addOpenSteps()
+
+    # the components below are created on first use, so their imports stay
+    # out of the startup of headless sessions
+
+    @LazyAttribute
+    def asyncSave(self):
+        from Prism_Hiero_Save import Prism_Hiero_AsyncSave
+
+        return Prism_Hiero_AsyncSave(self)
+
+    @LazyAttribute
+    def timelineSync(self):
+        from Prism_Hiero_Sync import Prism_Hiero_TimelineSync
+
+        return Prism_Hiero_TimelineSync(self)
+
+    @LazyAttribute
+    def thumbnailService(self):
+        from Prism_Hiero_Thumbnails import Prism_Hiero_ThumbnailService
+
+        return Prism_Hiero_ThumbnailService(self.thumbnailCache)
+
+    @LazyAttribute
+    def autosave(self):
+        from Prism_Hiero_Autosave import Prism_Hiero_Autosave
+
+        return Prism_Hiero_Autosave(self)
+
+    @LazyAttribute
+    def prefetcher(self):
+        from Prism_Hiero_Prefetch import Prism_Hiero_Prefetcher
+
+        return Prism_Hiero_Prefetcher(self.getSceneMetadata)
 
     @err_catcher(name=__name__)
+    @profiled()
     def startup(self, origin):
-        if self.core.uiAvailable:
-            origin.timer.stop()
+        if not self.core.uiAvailable:
+            return self.startupHeadless(origin)
 
-            for obj in QApplication.topLevelWidgets():
-                if (
-                    obj.inherits("QMainWindow")
-                    and obj.metaObject().className() == "Foundry::UI::DockMainWindow"
-                ):
-                    nukeQtParent = obj
-                    break
-            else:
-                nukeQtParent = QWidget()
+        origin.timer.stop()
 
-            origin.messageParent = QWidget()
-            origin.messageParent.setParent(nukeQtParent, Qt.Window)
-            if platform.system() != "Windows" and self.core.useOnTop:
-                origin.messageParent.setWindowFlags(
-                    origin.messageParent.windowFlags() ^ Qt.WindowStaysOnTopHint
-                )
+        nukeQtParent = self.hostLocator.getMainWindow()
+        if nukeQtParent is None:
+            nukeQtParent = QtWidgets.QWidget()
+
+        origin.messageParent = QtWidgets.QWidget()
+        origin.messageParent.setParent(nukeQtParent, QtCore.Qt.Window)
+        if platform.system() != "Windows" and self.core.useOnTop:
+            origin.messageParent.setWindowFlags(
+                origin.messageParent.windowFlags() ^ QtCore.Qt.WindowStaysOnTopHint
+            )
 
         self.addPluginPaths()
-        if self.core.uiAvailable:
-            print("adding menus!")
-            self.addMenus()
-        else:
-            print("skipping menus!")
+        print("adding menus!")
+        self.addMenus()
 
         self.addCallbacks()
         hiero.core.TaskPresetBase.addUserResolveEntries = self.global_addRenderPaths
+        from Prism_Hiero_Launcher import connectLauncher
+
+        connectLauncher(self.openLauncherScene)
+        self.autosave.start()
+
+    def openLauncherScene(self, filepath):
+        # called from the launcher thread, Hiero projects have to be opened in the main thread
+        return nuke.executeInMainThreadWithResult(self.openScene, args=(self.core, filepath))
+
+    @err_catcher(name=__name__)
+    def startupHeadless(self, origin):
+        # farm and batch export sessions only resolve paths and save projects,
+        # so there is no messageParent, menu, gizmo path or callback setup
+        if hasattr(origin, "timer"):
+            origin.timer.stop()
+
+        self.openPipeline.useEventLoop = False
+        self.projectIndex.register()
+        # exports resolve the shot tokens per track item, which needs the
+        # edit events to reuse the index instead of rescanning the sequence
+        self.shotIndex.register()
+        hiero.core.TaskPresetBase.addUserResolveEntries = self.global_addRenderPaths
 
     @err_catcher(name=__name__)
     def addPluginPaths(self):
@@ -111,43 +173,290 @@ class Prism_Hiero_Functions(object):
         prism_menuItems = []
         self.removeMenu()
         print('\n*** Loaded PRISM Toolbar ***\n')
-        menuBar = hiero.ui.menuBar()
-        prism_menu = menuBar.addMenu("Prism")
+        prism_menu = self.hostLocator.addMenu("Prism")
         prism_menuItems.append( prism_menu.addAction("Project Browser", self.core.projectBrowser) )
         prism_menuItems.append( prism_menu.addAction("Save Version", self.core.saveScene) )
         prism_menuItems.append( prism_menu.addAction("Save Comment", self.core.saveWithComment) )
         prism_menuItems.append( prism_menu.addAction("Settings", self.core.prismSettings) )
+        prism_menu.addSeparator()
+        prism_menuItems.append( prism_menu.addAction("Create Prism shots from sequence", self.createShotsFromSequenceDialog) )
         return
 
     @err_catcher(name=__name__)
     def removeMenu(self):
-        menuBar = hiero.ui.menuBar()
-        for child in menuBar.children():
-            try:
-                menuTitle = child.title()
-                if menuTitle == 'Prism':
-                    print('\n*** Removing Old Prism Toolbar ***\n')
-                    child.deleteLater()
-            except:
-                pass
+        if self.hostLocator.removeMenus("Prism"):
+            print('\n*** Removing Old Prism Toolbar ***\n')
 
     @err_catcher(name=__name__)
+    @profiled()
     def global_addRenderPaths(self, resolver):
+        for token, description, path in self.getRenderPathResolverEntries():
+            resolver.addResolver(token, description, path)
+
+        resolver.addResolver(
+            "{prism_sequence}",
+            "Prism sequence of the shot",
+            lambda keyword, task: self.resolveShotToken(task, "sequence"),
+        )
+        resolver.addResolver(
+            "{prism_shot}",
+            "Prism shot name",
+            lambda keyword, task: self.resolveShotToken(task, "shot"),
+        )
+
+    @err_catcher(name=__name__)
+    def resolveShotToken(self, task, key):
+        item = getattr(task, "_item", None)
+        if item is None:
+            return ""
+
+        # clips and other items outside of a sequence have no shot context
+        context = None
+        if isinstance(item, hiero.core.TrackItem):
+            context = self.getShotContext(item)
+
+        if context:
+            return context[key]
+
+        sequenceName, shotName = self.parseShotName(item.name())
+        return sequenceName if key == "sequence" else shotName
+
+    @err_catcher(name=__name__)
+    def getRenderPathCacheKey(self):
+        mtimes = []
+        for configPath in [getattr(self.core, "prismIni", ""), getattr(self.core, "userini", "")]:
+            try:
+                mtimes.append(os.path.getmtime(configPath))
+            except (OSError, TypeError):
+                mtimes.append(None)
+
+        return (getattr(self.core, "projectPath", ""), tuple(mtimes))
+
+    @err_catcher(name=__name__)
+    def getRenderPathResolverEntries(self):
+        key = self.getRenderPathCacheKey()
+        if key in self.renderPathCache:
+            self.renderPathCacheStats["hits"] += 1
+            return self.renderPathCache[key]
+
+        self.renderPathCacheStats["misses"] += 1
+        entries = []
         renderProductBasePaths = self.core.paths.getRenderProductBasePaths()
         for basePath in renderProductBasePaths:
-            resolver.addResolver("{{prism_{0}}}".format(basePath), "Prism {0} location: {1}".format(basePath, renderProductBasePaths[basePath]), renderProductBasePaths[basePath] )
+            entries.append((
+                "{{prism_{0}}}".format(basePath),
+                "Prism {0} location: {1}".format(basePath, renderProductBasePaths[basePath]),
+                renderProductBasePaths[basePath],
+            ))
+
+        self.renderPathCache = {key: entries}
+        return entries
+
+    @err_catcher(name=__name__)
+    def invalidateRenderPathCache(self):
+        self.renderPathCache = {}
+
+    @err_catcher(name=__name__)
+    def getRenderPathCacheStats(self):
+        stats = dict(self.renderPathCacheStats)
+        total = stats["hits"] + stats["misses"]
+        stats["hitRate"] = float(stats["hits"]) / total if total else 0.0
+        return stats
+
+
+    @err_catcher(name=__name__)
+    def getSequenceTrackItems(self, sequence=None):
+        if sequence is None:
+            sequence = hiero.ui.activeSequence()
+
+        if not sequence:
+            return []
+
+        trackItems = []
+        for track in sequence.videoTracks():
+            trackItems += list(track.items())
+
+        return trackItems
+
+    @err_catcher(name=__name__)
+    def parseShotName(self, name):
+        shotName, sequenceName = self.core.entities.splitShotname(name)
+        return sequenceName, shotName
+
+    @err_catcher(name=__name__)
+    def getShotContext(self, trackItem):
+        return self.shotIndex.getContext(trackItem)
+
+    @err_catcher(name=__name__)
+    @profiled()
+    def getShotContexts(self, sequence=None):
+        if sequence is None:
+            sequence = hiero.ui.activeSequence()
+
+        if not sequence:
+            return {}
 
+        return self.shotIndex.getShots(sequence)
+
+    @err_catcher(name=__name__)
+    def getShotEntityName(self, sequenceName, shotName):
+        if not sequenceName or sequenceName == "no sequence":
+            return shotName
+
+        return sequenceName + self.core.sequenceSeparator + shotName
+
+    @err_catcher(name=__name__)
+    def getShotPath(self, shotName):
+        return self.core.getEntityPath(entity="shot", shot=shotName)
+
+    @err_catcher(name=__name__)
+    def setShotRanges(self, ranges):
+        self.updateShotInfo("shotRanges", ranges)
+
+    @err_catcher(name=__name__)
+    def updateShotInfo(self, category, values):
+        data = self.core.getConfig(category, config="shotinfo") or {}
+        data.update(values)
+        self.core.setConfig(category, val=data, config="shotinfo")
+
+    @err_catcher(name=__name__)
+    @profiled()
+    def createShotsFromSequence(self, sequence=None, dryRun=False, threads=None):
+        if sequence is None:
+            sequence = hiero.ui.activeSequence()
+
+        if not sequence:
+            return None
+
+        creator = Prism_Hiero_ShotCreator(self, threads=threads)
+        return creator.execute(sequence, dryRun=dryRun)
+
+    @err_catcher(name=__name__)
+    def createShotsFromSequenceDialog(self):
+        sequence = hiero.ui.activeSequence()
+        if not sequence:
+            self.core.popup("There is no active sequence.")
+            return
+
+        result = self.core.popupQuestion(
+            "Create Prism shots for all track items of the sequence \"%s\"?" % sequence.name(),
+            title="Create Prism shots",
+            buttons=["Create", "Dry run", "Cancel"],
+        )
+        if result not in ["Create", "Dry run"]:
+            return
+
+        result = self.createShotsFromSequence(sequence, dryRun=result == "Dry run")
+        self.core.popup(self.getShotCreationReport(result), severity="info")
+
+    @err_catcher(name=__name__)
+    def getShotCreationReport(self, result):
+        lines = [
+            "%s shots in the sequence" % len(result["shots"]),
+            "%s shots %s" % (len(result["created"]), "would be created" if result["dryRun"] else "created"),
+            "%s shots already exist" % len(result["existing"]),
+        ]
+        if result["failed"]:
+            lines.append("%s shots failed:" % len(result["failed"]))
+            for name in sorted(result["failed"])[:20]:
+                lines.append("    %s: %s" % (name, result["failed"][name]))
+
+        lines.append("")
+        lines += ["%s: %.2fs" % (k, v) for k, v in result["timings"].items()]
+        return "\n".join(lines)
+
+    @err_catcher(name=__name__)
+    def getShotIndexStats(self):
+        return dict(self.shotIndex.stats)
+
+    @err_catcher(name=__name__)
+    @profiled()
+    def batchExport(self, preset, items=None, synchronous=False, threads=None):
+        if items is None:
+            items = self.getSequenceTrackItems()
+
+        exporter = Prism_Hiero_BatchExport(self, threads=threads)
+        return exporter.execute(preset, items, synchronous=synchronous)
 
     @err_catcher(name=__name__)
     def addCallbacks(self):
-        nuke.addOnScriptLoad(self.core.sceneOpen)
+        self.projectIndex.register()
+        self.currentFileTracker.register()
+        self.shotIndex.register()
+        hiero.core.events.registerInterest("kAfterProjectLoad", self.onProjectLoaded)
+        hiero.core.events.registerInterest("kAfterProjectSave", self.asyncSave.onProjectSaved)
+
+    @err_catcher(name=__name__)
+    def addOpenSteps(self):
+        # current file tracking and the autosave restart run immediately,
+        # the Prism callbacks and the checks are deferred. core.sceneOpen
+        # calls appPlugin.sceneOpen as well, which skips the restart then
+        self.openPipeline.addStep("currentFile", self.openStep_currentFile, "immediate", 0)
+        self.openPipeline.addStep("autosave", self.openStep_autosave, "immediate", 10)
+        self.openPipeline.addStep("prismSceneOpen", self.openStep_prismSceneOpen, "idle", 20)
+        self.openPipeline.addStep("mediaCheck", self.openStep_mediaCheck, "idle", 30)
+        self.openPipeline.addStep("shotContext", self.openStep_shotContext, "idle", 35)
+        self.openPipeline.addStep("metadataCache", self.openStep_metadataCache, "thread", 40)
 
     @err_catcher(name=__name__)
+    def onProjectLoaded(self, event):
+        if self.mediaValidator:
+            self.mediaValidator.cancel()
+
+        self.openPipeline.run(event.project, event.project.path())
+
+    def openStep_currentFile(self, context):
+        context.filepath = self.asyncSave.getTargetPath(context.filepath) or context.filepath
+        self.currentFileTracker.invalidate()
+
+    def openStep_autosave(self, context):
+        self.restartAutosave(self.core)
+
+    def openStep_prismSceneOpen(self, context):
+        self.inPrismSceneOpen = True
+        try:
+            self.core.sceneOpen()
+        finally:
+            self.inPrismSceneOpen = False
+
+    def openStep_mediaCheck(self, context):
+        if self.settings.get("validatemedia"):
+            self.validateProjectMedia(context.project, self.prefetcher.getListings(context.filepath))
+
+    def openStep_shotContext(self, context):
+        self.shotIndex.build(context.project.sequences())
+
+    def openStep_metadataCache(self, context):
+        self.getSceneMetadata(context.filepath)
+
+    @err_catcher(name=__name__)
+    def getOpenPipelineTimings(self):
+        return list(self.openPipeline.timings)
+
+    @err_catcher(name=__name__)
+    def getOpenProjectPaths(self):
+        return [project.path() for project in self.projectIndex.getProjects().values()]
+
+    @err_catcher(name=__name__)
+    def isProjectOpen(self, filepath):
+        return self.projectIndex.isOpen(filepath)
+
+    @err_catcher(name=__name__)
+    @profiled()
     def onProjectChanged(self, origin):
-        pass
+        self.invalidateRenderPathCache()
 
     @err_catcher(name=__name__)
+    @profiled()
     def sceneOpen(self, origin):
+        # the open pipeline restarted the autosave already
+        if self.inPrismSceneOpen:
+            return
+
+        self.restartAutosave(origin)
+
+    @err_catcher(name=__name__)
+    def restartAutosave(self, origin):
         if hasattr(origin, "asThread") and origin.asThread.isRunning():
             origin.startasThread()
 
@@ -163,7 +472,11 @@ class Prism_Hiero_Functions(object):
             return eval(code)
 
     @err_catcher(name=__name__)
+    @profiled()
     def getCurrentFileName(self, origin, path=True):
+        return self.currentFileTracker.getPath()
+
+    def resolveCurrentFileName(self):
         try:
             #currentFileName = nuke.root().name()
             activeSequence = hiero.ui.activeSequence()
@@ -171,23 +484,70 @@ class Prism_Hiero_Functions(object):
         except:
             currentFileName = ""
 
+        currentFileName = self.asyncSave.getTargetPath(currentFileName) or currentFileName
+
         if currentFileName == "Root":
             currentFileName = ""
 
         return currentFileName
 
+    @err_catcher(name=__name__)
+    def getActiveProject(self):
+        sequence = hiero.ui.activeSequence()
+        if not sequence:
+            return None
+
+        return sequence.project()
+
+    @err_catcher(name=__name__)
+    def getAutosaveStats(self):
+        return self.autosave.getStats()
+
+    @err_catcher(name=__name__)
+    def getCurrentFileTrackerStats(self):
+        return dict(self.currentFileTracker.stats)
+
     @err_catcher(name=__name__)
     def getSceneExtension(self, origin):
         return self.sceneFormats[0]
 
     @err_catcher(name=__name__)
+    @profiled()
     def saveScene(self, origin, filepath, details={}):
         try:
             sequence = hiero.ui.activeSequence()
             currentProject = sequence.project()
+            asyncSave = self.core.uiAvailable and self.settings.get("asyncsave")
+            # computing a delta on the UI thread costs more than a full save,
+            # so deltas are only written by the background upload
+            if asyncSave and self.settings.get("deltasave"):
+                basePath = self.getCurrentFileName(origin)
+                if not basePath or basePath == filepath:
+                    basePath = None
+
+                interval = self.settings.get("deltakeyframeinterval")
+                if interval:
+                    self.asyncSave.keyframeInterval = interval
+
+                return self.asyncSave.save(currentProject, filepath, basePath=basePath)
+
+            if asyncSave:
+                return self.asyncSave.save(currentProject, filepath)
+
             return currentProject.saveAs(filepath)
-        except:
-            return ""
+        except Exception as e:
+            logger.warning("failed to save the project to %s: %s" % (filepath, e))
+            return False
+        finally:
+            self.currentFileTracker.invalidate()
+
+    @err_catcher(name=__name__)
+    def getSaveStatus(self, filepath):
+        return self.asyncSave.status.get(filepath)
+
+    @err_catcher(name=__name__)
+    def getSaveTimings(self):
+        return list(self.asyncSave.timings)
 
     @err_catcher(name=__name__)
     def getImportPaths(self, origin):
@@ -200,19 +560,88 @@ class Prism_Hiero_Functions(object):
     @err_catcher(name=__name__)
     def onProjectBrowserStartup(self, origin):
         origin.actionStateManager.setEnabled(False)
+        # prefetch scenes on selection, the open only follows on a double
+        # click. The prefetch parses the scene metadata, which is shown as
+        # the tooltip of the scene once it is ready
+        for view in origin.findChildren(QtWidgets.QAbstractItemView):
+            view.clicked.connect(self.onBrowserItemClicked)
+
+    def onBrowserItemClicked(self, index):
+        filepath = self.getScenePathFromIndex(index)
+        if not filepath:
+            return
+
+        job = self.prefetchScene(filepath)
+        if job:
+            persistentIndex = QtCore.QPersistentModelIndex(index)
+            job.addCallback(
+                lambda job: nuke.executeInMainThread(
+                    self.setSceneToolTip, args=(persistentIndex, job.filepath, job.metadata)
+                )
+            )
 
     @err_catcher(name=__name__)
+    def setSceneToolTip(self, persistentIndex, filepath, metadata):
+        if not metadata or not persistentIndex.isValid():
+            return
+
+        model = persistentIndex.model()
+        index = model.index(persistentIndex.row(), persistentIndex.column(), persistentIndex.parent())
+        model.setData(index, self.getSceneMetadataText(filepath, metadata), QtCore.Qt.ToolTipRole)
+
+    @err_catcher(name=__name__)
+    def getScenePathFromIndex(self, index):
+        model = index.model()
+        for column in range(model.columnCount(index.parent())):
+            columnIndex = model.index(index.row(), column, index.parent())
+            for role in [QtCore.Qt.UserRole, QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole]:
+                value = columnIndex.data(role)
+                if (
+                    isinstance(value, str)
+                    and os.path.splitext(value)[1] in self.sceneFormats
+                    and os.path.isabs(value)
+                ):
+                    return value
+
+        return None
+
+    @err_catcher(name=__name__)
+    def prefetchScene(self, filepath):
+        if os.path.splitext(filepath)[1] not in self.sceneFormats or self.isProjectOpen(filepath):
+            return None
+
+        return self.prefetcher.prefetch(filepath)
+
+    @err_catcher(name=__name__)
+    def cancelPrefetch(self):
+        self.prefetcher.cancel()
+
+    @err_catcher(name=__name__)
+    def getPrefetchReport(self):
+        return self.prefetcher.lastReport
+
+    @err_catcher(name=__name__)
+    @profiled()
     def openScene(self, origin, filepath, force=False):
         if os.path.splitext(filepath)[1] not in self.sceneFormats:
             return False
 
-        openedProjects = []
-        for project in hiero.core.projects():
-            openedProjects.append(project.path())
-        if filepath not in openedProjects:
+        isOpen = self.projectIndex.isOpen(filepath) or self.projectIndex.isOpen(
+            self.asyncSave.getStagingPath(filepath)
+        )
+        if not isOpen:
             try:
                 #nuke.scriptOpen(filepath)
-                hiero.core.openProject(filepath)
+                # only a prefetch started from the browser selection can
+                # save time, starting one here would just race the open
+                prefetchJob = self.prefetcher.markOpened(filepath)
+                start = time.time()
+                project = hiero.core.openProject(self.asyncSave.openVersion(filepath))
+                if prefetchJob:
+                    self.prefetcher.report(filepath, time.time() - start)
+                if project:
+                    self.projectIndex.addProject(project)
+
                 return True
             except:
                 pass
@@ -220,7 +649,7 @@ class Prism_Hiero_Functions(object):
             nuke_launchmode = "Nuke Studio"
             if nuke.env["hiero"]:
                 nuke_launchmode = "Hiero"
-            QMessageBox.warning(
+            QtWidgets.QMessageBox.warning(
                 self.core.messageParent,
                 "Notice",
                 "This scene is already open in {0}:\n\n{1}".format( nuke_launchmode, filepath),
@@ -228,6 +657,56 @@ class Prism_Hiero_Functions(object):
 
         return False
 
+    @err_catcher(name=__name__)
+    def validateProjectMedia(self, project, directoryListings=None):
+        if self.mediaValidator:
+            self.mediaValidator.cancel()
+
+        mediaPaths = collectMediaPaths(project)
+        if not mediaPaths:
+            return
+
+        self.mediaValidator = Prism_Hiero_MediaValidator()
+        self.mediaValidator.validateAsync(mediaPaths, self.onMediaValidated, directoryListings)
+
+    def onMediaValidated(self, summary):
+        logger.info(
+            "validated %s media paths in %s directories in %.2fs (%.0f paths/s): %s offline, %s incomplete"
+            % (
+                summary["paths"],
+                summary["directories"],
+                summary["time"],
+                summary["pathsPerSecond"],
+                len(summary["offline"]),
+                len(summary["incomplete"]),
+            )
+        )
+        for clipName, path, state, missing in summary["offline"] + summary["incomplete"]:
+            logger.warning("%s media of clip %s: %s" % (state, clipName, path))
+
+        if self.core.uiAvailable and (summary["offline"] or summary["incomplete"]):
+            nuke.executeInMainThread(self.showMediaSummary, args=(summary,))
+
+    @err_catcher(name=__name__)
+    def showMediaSummary(self, summary):
+        problems = summary["offline"] + summary["incomplete"]
+        lines = []
+        for clipName, path, state, missing in problems[:20]:
+            if state == "incomplete":
+                lines.append("%s (%s frames missing): %s" % (clipName, len(missing), path))
+            else:
+                lines.append("%s (offline): %s" % (clipName, path))
+
+        if len(problems) > 20:
+            lines.append("... and %s more" % (len(problems) - 20))
+
+        msg = "%s of %s media paths in this project are offline or incomplete:\n\n%s" % (
+            len(problems),
+            summary["paths"],
+            "\n".join(lines),
+        )
+        self.core.popup(msg)
+
     @err_catcher(name=__name__)
     def correctExt(self, origin, lfilepath):
         return lfilepath
@@ -261,6 +740,7 @@ class Prism_Hiero_Functions(object):
         pass
 
     @err_catcher(name=__name__)
+    @profiled()
     def postSaveScene(self, origin, filepath, versionUp, comment, isPublish, details):
         """
         origin:     PrismCore instance
@@ -269,4 +749,36 @@ class Prism_Hiero_Functions(object):
         comment:    The string, which is used as the comment for the scenefile. Empty string if no comment was given.
         isPublish:  (bool) True if this save was triggered by a publish
         """
-        pass
+        if self.settings.get("synctimeline"):
+            self.syncTimeline()
+
+        if self.core.uiAvailable and self.settings.get("thumbnails"):
+            self.requestScenePreview(filepath)
+
+    @err_catcher(name=__name__)
+    def requestScenePreview(self, filepath, sequence=None):
+        if sequence is None:
+            sequence = hiero.ui.activeSequence()
+
+        if not sequence:
+            return
+
+        from Prism_Hiero_Thumbnails import getPosterImage
+
+        self.thumbnailService.request(
+            filepath,
+            functools.partial(getPosterImage, sequence),
+            previewPath=self.getScenePreviewPath(filepath),
+        )
+
+    @err_catcher(name=__name__)
+    @profiled()
+    def syncTimeline(self, sequence=None):
+        if sequence is None:
+            sequence = hiero.ui.activeSequence()
+
+        if not sequence:
+            return None
+
+        self.lastTimelineSync = self.timelineSync.sync(sequence)
+        return self.lastTimelineSync
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import logging
+
+from Prism_Hiero_Lazy import hiero, QtWidgets
+
+
+logger = logging.getLogger(__name__)
+
+
+def isValid(obj):
+    """Returns False if the Qt object behind a wrapper was deleted."""
+    if obj is None:
+        return False
+
+    try:
+        import shiboken2
+    except ImportError:
+        shiboken2 = None
+
+    if shiboken2 is not None:
+        return shiboken2.isValid(obj)
+
+    try:
+        obj.metaObject()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+class Prism_Hiero_HostLocator(object):
+    """Finds the Hiero main window and the Prism menus once and keeps them,
+    so later lookups don't walk the top level widgets or the menu bar
+    again. Only the Python wrappers are kept: the widgets are owned by
+    Hiero, so they are not kept alive by this and a deleted widget is
+    detected with isValid, which triggers a new scan. Python weak
+    references wouldn't work here, as PySide drops wrappers of widgets it
+    doesn't own as soon as they are no longer referenced. The module keeps
+    one locator for the session, which is reused when the plugin is
+    reloaded."""
+
+    mainWindowClass = "Foundry::UI::DockMainWindow"
+
+    def __init__(self):
+        self.mainWindow = None
+        self.menus = {}
+        self.stats = {"hits": 0, "scans": 0}
+
+    def getMainWindow(self):
+        if isValid(self.mainWindow):
+            self.stats["hits"] += 1
+            return self.mainWindow
+
+        self.stats["scans"] += 1
+        self.mainWindow = None
+        for obj in QtWidgets.QApplication.topLevelWidgets():
+            if (
+                obj.inherits("QMainWindow")
+                and obj.metaObject().className() == self.mainWindowClass
+            ):
+                self.mainWindow = obj
+                break
+
+        return self.mainWindow
+
+    def addMenu(self, title):
+        menu = hiero.ui.menuBar().addMenu(title)
+        self.menus.setdefault(title, []).append(menu)
+        return menu
+
+    def getMenus(self, title):
+        menus = [menu for menu in self.menus.get(title, []) if isValid(menu)]
+        if menus:
+            self.stats["hits"] += 1
+            return menus
+
+        # the first load of the session, or the menus were deleted by someone else
+        self.stats["scans"] += 1
+        menus = [
+            child
+            for child in hiero.ui.menuBar().children()
+            if isinstance(child, QtWidgets.QMenu) and child.title() == title
+        ]
+        self.menus[title] = menus
+        return menus
+
+    def removeMenus(self, title):
+        menus = self.getMenus(title)
+        for menu in menus:
+            menu.deleteLater()
+
+        self.menus.pop(title, None)
+        return len(menus)
+
+
+hostLocator = Prism_Hiero_HostLocator()
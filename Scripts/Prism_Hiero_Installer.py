@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import re
+import sys
+import glob
+import time
+import shutil
+import hashlib
+import logging
+import platform
+import argparse
+
+from Prism_Hiero_Utils import readJson, writeJson
+
+
+logger = logging.getLogger(__name__)
+
+integrationFiles = ["hiero_menu.py", "hiero_init.py", "__init__.py"]
+manifestName = "prism_manifest.json"
+manifestVersion = 1
+prismBlockPattern = re.compile(r"# >>>PrismStart.*?# <<<PrismEnd[^\n]*\n?", re.DOTALL)
+
+
+def getIntegrationBase():
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Integration")
+
+
+def getStartupFolder(installPath):
+    return os.path.join(installPath, "Python", "Startup", "Prism_Hiero")
+
+
+def renderTemplates(prismRoot, integrationBase=None):
+    integrationBase = integrationBase or getIntegrationBase()
+    templates = {}
+    for integrationFile in integrationFiles:
+        with open(os.path.join(integrationBase, integrationFile), "r") as f:
+            templates[integrationFile] = f.read().replace(
+                "PRISMROOT", '"%s"' % prismRoot.replace("\\", "/")
+            )
+
+    return templates
+
+
+def removePrismBlocks(text):
+    return prismBlockPattern.sub("", text)
+
+
+def getHash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def getFileState(path):
+    try:
+        fileStat = os.stat(path)
+    except OSError:
+        return None
+
+    return [fileStat.st_size, fileStat.st_mtime]
+
+
+def readText(path):
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r") as f:
+        return f.read()
+
+
+def applyChanges(folder, changes):
+    """Writes all changes (target path: new text, or None to delete the
+    file) of one install folder as a transaction. New content gets staged
+    next to the targets and renamed into place. If anything fails, the
+    previous state is restored and the error is raised."""
+    createdFolder = False
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+        createdFolder = True
+
+    staged = {}
+    backups = {}
+    replaced = []
+    try:
+        for target, text in changes.items():
+            if text is None:
+                continue
+
+            stagedPath = target + ".prism_tmp"
+            with open(stagedPath, "w") as f:
+                f.write(text)
+
+            staged[target] = stagedPath
+
+        for target, text in changes.items():
+            if os.path.exists(target):
+                backups[target] = target + ".prism_bak"
+                os.replace(target, backups[target])
+
+            replaced.append(target)
+            if text is not None:
+                os.replace(staged[target], target)
+                del staged[target]
+                if platform.system() in ["Linux", "Darwin"]:
+                    os.chmod(target, 0o777)
+    except Exception:
+        for target in replaced:
+            if os.path.exists(target) and changes[target] is not None:
+                os.remove(target)
+
+            if target in backups and os.path.exists(backups[target]):
+                os.replace(backups[target], target)
+
+        for stagedPath in staged.values():
+            if os.path.exists(stagedPath):
+                os.remove(stagedPath)
+
+        if createdFolder:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        raise
+
+    for backup in backups.values():
+        os.remove(backup)
+
+
+class Prism_Hiero_Installer(object):
+    """Installs or removes the Hiero integration in many .nuke folders in
+    parallel, without any UI. Errors are collected in a summary instead of
+    being shown in dialogs."""
+
+    def __init__(self, prismRoot, threads=16, integrationBase=None):
+        self.prismRoot = prismRoot
+        self.threads = threads
+        self.templates = renderTemplates(prismRoot, integrationBase)
+
+    def readManifest(self, folder):
+        manifest = readJson(os.path.join(folder, manifestName))
+        if not manifest or manifest.get("version") != manifestVersion:
+            return {}
+
+        return manifest.get("files", {})
+
+    def writeManifest(self, folder):
+        files = {}
+        for integrationFile, template in self.templates.items():
+            files[integrationFile] = {
+                "blockHash": getHash(template),
+                "state": getFileState(os.path.join(folder, integrationFile)),
+            }
+
+        writeJson(
+            os.path.join(folder, manifestName),
+            {"version": manifestVersion, "prismRoot": self.prismRoot, "files": files},
+        )
+
+    def isUpToDate(self, folder, manifest):
+        # the manifest matches if the templates are unchanged and nobody
+        # touched the files since they were written, no need to read them
+        for integrationFile, template in self.templates.items():
+            entry = manifest.get(integrationFile)
+            if (
+                not entry
+                or entry.get("blockHash") != getHash(template)
+                or entry.get("state") != getFileState(os.path.join(folder, integrationFile))
+            ):
+                return False
+
+        return True
+
+    def getInstallChanges(self, installPath):
+        folder = getStartupFolder(installPath)
+        changes = {}
+        for integrationFile, template in self.templates.items():
+            target = os.path.join(folder, integrationFile)
+            current = readText(target)
+            text = removePrismBlocks(current or "") + template
+            if current is None or getHash(current) != getHash(text):
+                changes[target] = text
+
+        return folder, changes
+
+    def getRemoveChanges(self, installPath):
+        folder = getStartupFolder(installPath)
+        changes = {}
+        for integrationFile in integrationFiles:
+            target = os.path.join(folder, integrationFile)
+            current = readText(target)
+            if current is None:
+                continue
+
+            text = removePrismBlocks(current)
+            if not text.strip():
+                changes[target] = None
+            elif text != current:
+                changes[target] = text
+
+        manifestPath = os.path.join(folder, manifestName)
+        if os.path.exists(manifestPath):
+            changes[manifestPath] = None
+
+        return folder, changes
+
+    def installPath(self, installPath):
+        if not os.path.isdir(installPath):
+            raise Exception("Invalid Hiero path: %s. The path doesn't exist." % installPath)
+
+        folder = getStartupFolder(installPath)
+        manifest = self.readManifest(folder)
+        if manifest and self.isUpToDate(folder, manifest):
+            return "upToDate"
+
+        folder, changes = self.getInstallChanges(installPath)
+        if changes:
+            applyChanges(folder, changes)
+
+        self.writeManifest(folder)
+        return "installed" if changes else "upToDate"
+
+    def verifyPath(self, installPath):
+        """Checks the integration in installPath without changing anything.
+        Returns "ok", "missing" if a file or the Prism block in it is
+        missing, "modified" if a block was changed or duplicated after it
+        was installed, or "outdated" if it differs from the current
+        templates."""
+        folder = getStartupFolder(installPath)
+        manifest = self.readManifest(folder)
+        result = "ok"
+        for integrationFile, template in self.templates.items():
+            current = readText(os.path.join(folder, integrationFile))
+            if current is None:
+                return "missing"
+
+            blocks = prismBlockPattern.findall(current)
+            if not blocks:
+                return "missing"
+
+            entry = manifest.get(integrationFile)
+            if len(blocks) > 1 or (entry and getHash(blocks[0]) != entry.get("blockHash")):
+                return "modified"
+
+            if getHash(blocks[0]) != getHash(template):
+                result = "outdated"
+
+        return result
+
+    def removePath(self, installPath):
+        folder, changes = self.getRemoveChanges(installPath)
+        if changes:
+            applyChanges(folder, changes)
+
+        pycacheDir = os.path.join(folder, "__pycache__")
+        if os.path.exists(pycacheDir):
+            shutil.rmtree(pycacheDir)
+
+        if os.path.isdir(folder) and not os.listdir(folder):
+            os.rmdir(folder)
+
+        return "removed" if changes else "upToDate"
+
+    def run(self, installPaths, func):
+        from concurrent.futures import ThreadPoolExecutor
+
+        start = time.time()
+        summary = {
+            "installed": [],
+            "removed": [],
+            "upToDate": [],
+            "ok": [],
+            "missing": [],
+            "modified": [],
+            "outdated": [],
+            "failed": {},
+        }
+        installPaths = list(dict.fromkeys(installPaths))
+
+        def execute(installPath):
+            try:
+                return installPath, func(installPath), None
+            except Exception as e:
+                return installPath, None, str(e)
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for installPath, result, error in executor.map(execute, installPaths):
+                if error:
+                    summary["failed"][installPath] = error
+                else:
+                    summary[result].append(installPath)
+
+        summary["time"] = time.time() - start
+        return summary
+
+    def install(self, installPaths):
+        return self.run(installPaths, self.installPath)
+
+    def remove(self, installPaths):
+        return self.run(installPaths, self.removePath)
+
+    def verify(self, installPaths):
+        return self.run(installPaths, self.verifyPath)
+
+
+def getUserInstallPaths(usersRoot):
+    return sorted(
+        path for path in glob.glob(os.path.join(usersRoot, "*", ".nuke")) if os.path.isdir(path)
+    )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Installs or removes the Prism Hiero integration in many .nuke folders."
+    )
+    parser.add_argument("paths", nargs="*", help=".nuke folders")
+    parser.add_argument("--prism-root", default=os.getenv("PRISM_ROOT"), help="Prism installation folder")
+    parser.add_argument("--users-root", action="append", default=[], help="adds <users-root>/*/.nuke, e.g. /home")
+    parser.add_argument("--paths-file", help="file with one .nuke folder per line")
+    parser.add_argument("--remove", action="store_true", help="remove the integration instead")
+    parser.add_argument("--verify", action="store_true", help="only check the installed integrations")
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args(args)
+
+    installPaths = list(args.paths)
+    for usersRoot in args.users_root:
+        installPaths += getUserInstallPaths(usersRoot)
+
+    if args.paths_file:
+        with open(args.paths_file, "r") as f:
+            installPaths += [line.strip() for line in f if line.strip()]
+
+    if not args.remove and not args.prism_root:
+        parser.error("--prism-root or PRISM_ROOT is required to install or verify the integration")
+
+    installer = Prism_Hiero_Installer(args.prism_root or "", threads=args.threads)
+    if args.verify:
+        summary = installer.verify(installPaths)
+        print(
+            "%s ok, %s outdated, %s modified, %s missing, %s failed in %.2fs"
+            % (
+                len(summary["ok"]),
+                len(summary["outdated"]),
+                len(summary["modified"]),
+                len(summary["missing"]),
+                len(summary["failed"]),
+                summary["time"],
+            )
+        )
+        for state in ["outdated", "modified", "missing"]:
+            for installPath in sorted(summary[state]):
+                print("%s: %s" % (state, installPath))
+    else:
+        if args.remove:
+            summary = installer.remove(installPaths)
+        else:
+            summary = installer.install(installPaths)
+
+        print(
+            "%s installed, %s removed, %s up to date, %s failed in %.2fs"
+            % (
+                len(summary["installed"]),
+                len(summary["removed"]),
+                len(summary["upToDate"]),
+                len(summary["failed"]),
+                summary["time"],
+            )
+        )
+
+    for installPath in sorted(summary["failed"]):
+        print("failed: %s: %s" % (installPath, summary["failed"][installPath]))
+
+    if summary["failed"] or (args.verify and len(summary["ok"]) != len(installPaths)):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
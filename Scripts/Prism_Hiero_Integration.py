@@ -39,18 +39,12 @@
 import os
 import sys
 import platform
-import shutil
-
-try:
-    from PySide2.QtCore import *
-    from PySide2.QtGui import *
-    from PySide2.QtWidgets import *
-except:
-    from PySide.QtCore import *
-    from PySide.QtGui import *
 
 from PrismUtils.Decorators import err_catcher_plugin as err_catcher
 
+from Prism_Hiero_Lazy import QtCore, QtWidgets
+from Prism_Hiero_Profiler import profiled
+
 
 class Prism_Hiero_Integration(object):
     def __init__(self, core, plugin):
@@ -75,100 +69,75 @@ class Prism_Hiero_Integration(object):
 
     @err_catcher(name=__name__)
     def getExecutable(self):
-        execPath = ""
-        if platform.system() == "Windows":
+        execPath = self.getExecutableFinder().getExecutable(self.appVersionPresets) or ""
+        if not execPath and platform.system() == "Windows":
             execPath = "C:\\Program Files\\Nuke13.2v3\\Nuke13.2.exe"
 
         return execPath
 
-    def addIntegration(self, installPath):
-        try:
-            if not os.path.exists(installPath):
-                QMessageBox.warning(
-                    self.core.messageParent,
-                    "Prism Integration",
-                    "Invalid Hiero path: %s.\nThe path doesn't exist." % installPath,
-                    QMessageBox.Ok,
-                )
-                return False
-            houdini_startup = os.path.join(installPath, r"Python\Startup\Prism_Hiero")
-            if not os.path.exists(houdini_startup):
-                os.makedirs(houdini_startup)
-            integrationBase = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "Integration"
-            )
-            addedFiles = []
-
-            integrationFiles = ["hiero_menu.py", "hiero_init.py", "__init__.py"]
+    def getInstaller(self, threads):
+        # imported on demand, as sessions which don't install integrations
+        # shouldn't pay for its imports
+        from Prism_Hiero_Installer import Prism_Hiero_Installer
 
-            for integrationFile in integrationFiles:
-                origMenuFile = os.path.join(integrationBase, integrationFile)
-                with open(origMenuFile, "r") as mFile:
-                    initStr = mFile.read()
+        return Prism_Hiero_Installer(self.core.prismRoot, threads=threads)
 
-                menuFile = os.path.join(houdini_startup, integrationFile)
-                self.core.integration.removeIntegrationData(filepath=menuFile)
-
-                with open(menuFile, "a") as initfile:
-                    initStr = initStr.replace(
-                        "PRISMROOT", '"%s"' % self.core.prismRoot.replace("\\", "/")
-                    )
-                    initfile.write(initStr)
-
-                addedFiles.append(menuFile)
-
-            if platform.system() in ["Linux", "Darwin"]:
-                for i in addedFiles:
-                    os.chmod(i, 0o777)
+    @err_catcher(name=__name__)
+    def installIntegrations(self, installPaths, threads=16):
+        installer = self.getInstaller(threads)
+        return installer.install(installPaths)
 
-            return True
+    @err_catcher(name=__name__)
+    def removeIntegrations(self, installPaths, threads=16):
+        installer = self.getInstaller(threads)
+        return installer.remove(installPaths)
 
-        except Exception as e:
-            exc_type, exc_obj, exc_tb = sys.exc_info()
+    @err_catcher(name=__name__)
+    def verifyIntegrations(self, installPaths, threads=16):
+        installer = self.getInstaller(threads)
+        return installer.verify(installPaths)
 
-            msgStr = (
-                "Errors occurred during the installation of the Nuke integration.\nThe installation is possibly incomplete.\n\n%s\n%s\n%s"
-                % (str(e), exc_type, exc_tb.tb_lineno)
+    @profiled()
+    def addIntegration(self, installPath):
+        if not os.path.exists(installPath):
+            QtWidgets.QMessageBox.warning(
+                self.core.messageParent,
+                "Prism Integration",
+                "Invalid Hiero path: %s.\nThe path doesn't exist." % installPath,
+                QtWidgets.QMessageBox.Ok,
             )
-            msgStr += "\n\nRunning this application as administrator could solve this problem eventually."
-
-            QMessageBox.warning(self.core.messageParent, "Prism Integration", msgStr)
             return False
 
-    def removeIntegration(self, installPath):
-        houdini_startup = os.path.join(installPath, "Python/Startup/Prism_Hiero")
-        try:
-
-            integrationFiles = ["hiero_menu.py", "hiero_init.py", "__init__.py"]
+        summary = self.installIntegrations([installPath])
+        if summary and not summary["failed"]:
+            return True
 
-            for integrationFile in integrationFiles:
-                fpath = os.path.join(houdini_startup, integrationFile)
+        error = summary["failed"][installPath] if summary else ""
+        msgStr = (
+            "Errors occurred during the installation of the Nuke integration.\nThe installation is possibly incomplete.\n\n%s"
+            % error
+        )
+        msgStr += "\n\nRunning this application as administrator could solve this problem eventually."
 
-                self.core.integration.removeIntegrationData(filepath=fpath)
+        QtWidgets.QMessageBox.warning(self.core.messageParent, "Prism Integration", msgStr)
+        return False
 
-            #self.core.integration.removeIntegrationData(filepath=houdini_startup)
-            pycache_dir = os.path.join(houdini_startup, "__pycache__")
-            if os.path.exists(pycache_dir):
-                shutil.rmtree(pycache_dir)
-            if os.path.exists(houdini_startup):
-                os.rmdir(houdini_startup)
+    @profiled()
+    def removeIntegration(self, installPath):
+        summary = self.removeIntegrations([installPath])
+        if summary and not summary["failed"]:
             return True
 
-        except Exception as e:
-            exc_type, exc_obj, exc_tb = sys.exc_info()
+        error = summary["failed"][installPath] if summary else ""
+        msgStr = "Errors occurred during the removal of the Nuke integration.\n\n%s" % error
+        msgStr += "\n\nRunning this application as administrator could solve this problem eventually."
 
-            msgStr = (
-                "Errors occurred during the removal of the Nuke integration.\n\n%s\n%s\n%s"
-                % (str(e), exc_type, exc_tb.tb_lineno)
-            )
-            msgStr += "\n\nRunning this application as administrator could solve this problem eventually."
-
-            QMessageBox.warning(self.core.messageParent, "Prism Integration", msgStr)
-            return False
+        QtWidgets.QMessageBox.warning(self.core.messageParent, "Prism Integration", msgStr)
+        return False
 
     def updateInstallerUI(self, userFolders, pItem):
         try:
-            hieroItem = QTreeWidgetItem(["Hiero"])
+            hieroItem = QtWidgets.QTreeWidgetItem(["Hiero"])
             pItem.addChild(hieroItem)
 
             if platform.system() == "Windows":
@@ -189,15 +158,15 @@ class Prism_Hiero_Integration(object):
                 hieroPath = "/Users/%s/.nuke" % userName
 
             if os.path.exists(hieroPath):
-                hieroItem.setCheckState(0, Qt.Checked)
+                hieroItem.setCheckState(0, QtCore.Qt.Checked)
                 hieroItem.setText(1, hieroPath)
                 hieroItem.setToolTip(0, hieroPath)
             else:
-                hieroItem.setCheckState(0, Qt.Unchecked)
+                hieroItem.setCheckState(0, QtCore.Qt.Unchecked)
                 hieroItem.setText(1, "< doubleclick to browse path >")
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
-            msg = QMessageBox.warning(
+            msg = QtWidgets.QMessageBox.warning(
                 self.core.messageParent,
                 "Prism Installation",
                 "Errors occurred during the installation.\n The installation is possibly incomplete.\n\n%s\n%s\n%s\n%s"
@@ -209,7 +178,7 @@ class Prism_Hiero_Integration(object):
         try:
             installLocs = []
 
-            if hieroItem.checkState(0) == Qt.Checked and os.path.exists(
+            if hieroItem.checkState(0) == QtCore.Qt.Checked and os.path.exists(
                 hieroItem.text(1)
             ):
                 result["Hiero integration"] = self.core.integration.addIntegration(self.plugin.pluginName, path=hieroItem.text(1), quiet=True)
@@ -219,7 +188,7 @@ class Prism_Hiero_Integration(object):
             return installLocs
         except Exception as e:
             exc_type, exc_obj, exc_tb = sys.exc_info()
-            msg = QMessageBox.warning(
+            msg = QtWidgets.QMessageBox.warning(
                 self.core.messageParent,
                 "Prism Installation",
                 "Errors occurred during the installation.\n The installation is possibly incomplete.\n\n%s\n%s\n%s\n%s"
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import json
+import time
+import uuid
+import atexit
+import socket
+import logging
+import threading
+import subprocess
+import collections
+
+
+logger = logging.getLogger(__name__)
+
+addressVar = "PRISM_HIERO_LAUNCHER"
+tokenVar = "PRISM_HIERO_LAUNCHER_TOKEN"
+keyVar = "PRISM_HIERO_LAUNCHER_KEY"
+
+
+def sendMessage(conn, data):
+    conn.sendall((json.dumps(data) + "\n").encode("utf-8"))
+
+
+def readMessage(fileObj):
+    line = fileObj.readline()
+    if not line:
+        return None
+
+    return json.loads(line.decode("utf-8"))
+
+
+class WarmProcess(object):
+    def __init__(self, key, process):
+        self.key = key
+        self.process = process
+        self.conn = None
+        self.reader = None
+        self.startTime = time.time()
+        self.readyTime = None
+
+    def isAlive(self):
+        return self.process.poll() is None
+
+    def terminate(self):
+        if self.conn:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+
+        if self.isAlive():
+            self.process.terminate()
+
+
+class Prism_Hiero_LauncherPool(object):
+    """Keeps one idle, pre-started Hiero/Nuke Studio process per executable
+    and launch flag. The processes register on a local socket once the Prism
+    plugin in them started (see connectLauncher) and get the project to open
+    sent over that connection. A consumed process gets replaced in the
+    background."""
+
+    def __init__(self, registerTimeout=600):
+        self.registerTimeout = registerTimeout
+        self.token = uuid.uuid4().hex
+        self.server = None
+        self.lock = threading.Lock()
+        self.starting = {}
+        self.idle = {}
+        self.metrics = collections.deque(maxlen=100)
+
+    def start(self):
+        if self.server:
+            return
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(8)
+        thread = threading.Thread(target=self.acceptConnections, name="PrismHieroLauncherPool")
+        thread.daemon = True
+        thread.start()
+        atexit.register(self.shutdown)
+
+    def getAddress(self):
+        host, port = self.server.getsockname()
+        return "%s:%s" % (host, port)
+
+    def getKey(self, appPath, args):
+        return json.dumps([appPath] + list(args))
+
+    def warm(self, appPath, args):
+        self.start()
+        key = self.getKey(appPath, args)
+        with self.lock:
+            if key in self.idle and self.idle[key].isAlive():
+                return
+
+            if key in self.starting and self.starting[key].isAlive():
+                if time.time() - self.starting[key].startTime < self.registerTimeout:
+                    return
+
+                self.starting[key].terminate()
+
+            env = dict(os.environ)
+            env[addressVar] = self.getAddress()
+            env[tokenVar] = self.token
+            env[keyVar] = key
+            process = subprocess.Popen([appPath] + list(args), env=env)
+            self.starting[key] = WarmProcess(key, process)
+            logger.debug("started warm process %s: %s" % (process.pid, key))
+
+    def acceptConnections(self):
+        while True:
+            try:
+                conn, address = self.server.accept()
+            except OSError:
+                return
+
+            thread = threading.Thread(target=self.register, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def register(self, conn):
+        try:
+            conn.settimeout(30)
+            reader = conn.makefile("rb")
+            data = readMessage(reader)
+            conn.settimeout(None)
+        except (OSError, ValueError):
+            conn.close()
+            return
+
+        if not data or data.get("token") != self.token:
+            conn.close()
+            return
+
+        with self.lock:
+            warmProcess = self.starting.pop(data.get("key"), None)
+            if not warmProcess:
+                conn.close()
+                return
+
+            warmProcess.conn = conn
+            warmProcess.reader = reader
+            warmProcess.readyTime = time.time()
+            self.idle[warmProcess.key] = warmProcess
+
+        logger.debug(
+            "warm process %s is ready after %.1fs"
+            % (warmProcess.process.pid, warmProcess.readyTime - warmProcess.startTime)
+        )
+
+    def open(self, appPath, args, filepath):
+        """Sends filepath to an idle process. Returns False if there was none,
+        in which case the caller has to launch the application itself."""
+        key = self.getKey(appPath, args)
+        with self.lock:
+            warmProcess = self.idle.pop(key, None)
+
+        opened = False
+        if warmProcess and warmProcess.isAlive():
+            start = time.time()
+            try:
+                sendMessage(warmProcess.conn, {"open": filepath})
+                opened = True
+            except OSError as e:
+                logger.debug("failed to send project to warm process: %s" % e)
+                warmProcess.terminate()
+
+            if opened:
+                thread = threading.Thread(
+                    target=self.waitForOpen, args=(warmProcess, filepath, start)
+                )
+                thread.daemon = True
+                thread.start()
+
+        self.warm(appPath, args)
+        return opened
+
+    def waitForOpen(self, warmProcess, filepath, start):
+        try:
+            data = readMessage(warmProcess.reader)
+        except (OSError, ValueError):
+            data = None
+
+        metric = {
+            "path": filepath,
+            "pid": warmProcess.process.pid,
+            "timeToOpen": time.time() - start,
+            "success": bool(data and data.get("result")),
+        }
+        self.metrics.append(metric)
+        logger.debug("warm process opened %s in %.2fs" % (filepath, metric["timeToOpen"]))
+        try:
+            warmProcess.conn.close()
+        except OSError:
+            pass
+
+    def shutdown(self):
+        with self.lock:
+            processes = list(self.idle.values()) + list(self.starting.values())
+            self.idle = {}
+            self.starting = {}
+
+        for warmProcess in processes:
+            warmProcess.terminate()
+
+        if self.server:
+            try:
+                self.server.close()
+            except OSError:
+                pass
+
+            self.server = None
+
+
+def connectLauncher(openCallback):
+    """Registers this process in the launcher pool which started it, if any,
+    and calls openCallback with the project path once it gets one."""
+    address = os.environ.pop(addressVar, None)
+    token = os.environ.pop(tokenVar, None)
+    key = os.environ.pop(keyVar, None)
+    if not address:
+        return
+
+    def run():
+        try:
+            host, port = address.rsplit(":", 1)
+            conn = socket.create_connection((host, int(port)))
+            reader = conn.makefile("rb")
+            sendMessage(conn, {"token": token, "key": key, "pid": os.getpid()})
+            data = readMessage(reader)
+        except (OSError, ValueError) as e:
+            logger.warning("failed to connect to the Prism launcher: %s" % e)
+            return
+
+        if not data or "open" not in data:
+            conn.close()
+            return
+
+        try:
+            result = openCallback(data["open"])
+        except Exception as e:
+            logger.warning("failed to open %s: %s" % (data["open"], e))
+            result = False
+
+        try:
+            sendMessage(conn, {"opened": data["open"], "result": bool(result)})
+        except OSError:
+            pass
+
+        conn.close()
+
+    thread = threading.Thread(target=run, name="PrismHieroLauncher")
+    thread.daemon = True
+    thread.start()
+    return thread
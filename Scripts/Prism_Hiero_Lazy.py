@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import importlib
+
+
+class LazyModule(object):
+    """Module proxy that imports the first available of the given module
+    names when one of its attributes is accessed for the first time."""
+
+    def __init__(self, *names):
+        self._names = names
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            error = None
+            for name in self._names:
+                try:
+                    self._module = importlib.import_module(name)
+                    break
+                except ImportError as e:
+                    error = e
+            else:
+                raise error
+
+        return self._module
+
+    def isLoaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+class LazyAttribute(object):
+    """Decorator for a method which creates an attribute on first access.
+    The result replaces the descriptor on the instance, so the method runs
+    once and later accesses are plain attribute lookups."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objType=None):
+        if obj is None:
+            return self
+
+        value = self.func(obj)
+        obj.__dict__[self.name] = value
+        return value
+
+
+nuke = LazyModule("nuke")
+hiero = LazyModule("hiero")
+
+QtCore = LazyModule("PySide2.QtCore", "PySide.QtCore")
+QtGui = LazyModule("PySide2.QtGui", "PySide.QtGui")
+QtWidgets = LazyModule("PySide2.QtWidgets", "PySide.QtGui")
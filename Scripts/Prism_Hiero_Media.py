@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import re
+import time
+import logging
+import threading
+
+from Prism_Hiero_Lazy import hiero
+
+
+logger = logging.getLogger(__name__)
+
+framePattern = re.compile(r"(#+|@+|%0?(\d*)d)")
+
+
+def iterBinClips(binObj):
+    for item in binObj.items():
+        if isinstance(item, hiero.core.Bin):
+            for clip in iterBinClips(item):
+                yield clip
+        elif isinstance(item, hiero.core.BinItem):
+            activeItem = item.activeItem()
+            if isinstance(activeItem, hiero.core.Clip):
+                yield activeItem
+
+
+def collectMediaPaths(project):
+    """Returns (clip name, path, first frame, last frame) for the media of
+    every clip in the project. Has to run on the main thread."""
+    mediaPaths = []
+    for clip in iterBinClips(project.clipsBin()):
+        try:
+            fileInfos = clip.mediaSource().fileinfos()
+        except Exception:
+            continue
+
+        for fileInfo in fileInfos:
+            mediaPaths.append(
+                (clip.name(), fileInfo.filename(), fileInfo.startFrame(), fileInfo.endFrame())
+            )
+
+    return mediaPaths
+
+
+def getFrameRegex(filename):
+    match = framePattern.search(filename)
+    if not match:
+        return None
+
+    token = match.group(1)
+    if token[0] in "#@":
+        padding = len(token)
+    else:
+        padding = int(match.group(2) or 1)
+
+    return re.compile(
+        "^%s(\\d{%s,})%s$"
+        % (re.escape(filename[:match.start()]), padding, re.escape(filename[match.end():]))
+    )
+
+
+def listDirectory(directory):
+    try:
+        return set(os.listdir(directory))
+    except OSError:
+        return None
+
+
+def validateDirectory(directory, entries, listing=None):
+    """Checks the given (clip name, path, first frame, last frame) entries,
+    which all reference files in directory, against a single listing of the
+    directory. Returns a list of (clip name, path, state, missing frames)."""
+    if listing is None:
+        listing = listDirectory(directory)
+
+    results = []
+    for clipName, path, first, last in entries:
+        filename = os.path.basename(path)
+        if listing is None:
+            results.append((clipName, path, "offline", None))
+            continue
+
+        frameRegex = getFrameRegex(filename)
+        if not frameRegex:
+            state = "ok" if filename in listing else "offline"
+            results.append((clipName, path, state, None))
+            continue
+
+        frames = set()
+        for name in listing:
+            match = frameRegex.match(name)
+            if match:
+                frames.add(int(match.group(1)))
+
+        if not frames:
+            results.append((clipName, path, "offline", None))
+            continue
+
+        missing = [frame for frame in range(first, last + 1) if frame not in frames]
+        results.append((clipName, path, "incomplete" if missing else "ok", missing))
+
+    return results
+
+
+class Prism_Hiero_MediaValidator(object):
+    """Validates the media paths of a project on a thread pool, grouped by
+    directory so every directory gets listed only once."""
+
+    def __init__(self, threads=16):
+        self.threads = threads
+        self.cancelled = False
+        self.summary = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def validate(self, mediaPaths, directoryListings=None):
+        from concurrent.futures import ThreadPoolExecutor
+
+        start = time.time()
+        directories = {}
+        for entry in mediaPaths:
+            directories.setdefault(os.path.dirname(entry[1]), []).append(entry)
+
+        directoryListings = directoryListings or {}
+        results = []
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            futures = []
+            for directory, entries in directories.items():
+                futures.append(
+                    executor.submit(
+                        self.validateDirectory, directory, entries, directoryListings.get(directory)
+                    )
+                )
+
+            for future in futures:
+                results += future.result()
+
+        elapsed = time.time() - start
+        summary = {
+            "paths": len(mediaPaths),
+            "directories": len(directories),
+            "offline": [r for r in results if r[2] == "offline"],
+            "incomplete": [r for r in results if r[2] == "incomplete"],
+            "time": elapsed,
+            "pathsPerSecond": len(mediaPaths) / elapsed if elapsed else 0.0,
+            "cancelled": self.cancelled,
+        }
+        self.summary = summary
+        return summary
+
+    def validateDirectory(self, directory, entries, listing=None):
+        if self.cancelled:
+            return []
+
+        return validateDirectory(directory, entries, listing)
+
+    def validateAsync(self, mediaPaths, callback, directoryListings=None):
+        def run():
+            try:
+                summary = self.validate(mediaPaths, directoryListings)
+            except Exception as e:
+                logger.warning("media validation failed: %s" % e)
+                return
+
+            if not self.cancelled:
+                callback(summary)
+
+        thread = threading.Thread(target=run, name="PrismHieroMediaValidation")
+        thread.daemon = True
+        thread.start()
+        return thread
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import io
+import os
+import hashlib
+import logging
+import xml.etree.ElementTree as ET
+
+import Prism_Hiero_Delta
+from Prism_Hiero_Utils import getCacheDir, readJson, writeJson
+
+
+logger = logging.getLogger(__name__)
+
+cacheVersion = 1
+mediaAttributes = ["file", "filename", "path", "mediapath"]
+mediaTags = ["mediasource", "source", "media", "mediasourcefile"]
+frameRateNames = ["framerate", "fps", "timebase"]
+
+
+def getLocalName(tag):
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def readMetadata(path):
+    """Reads sequences, frame rates, clip counts and media paths from a
+    .hrox file with an incremental parser. Elements are discarded as soon as
+    they are processed, so memory use doesn't grow with the project size."""
+    if Prism_Hiero_Delta.isDeltaFile(path):
+        source = io.BytesIO(Prism_Hiero_Delta.readFile(path))
+    else:
+        source = path
+
+    sequences = []
+    mediaPaths = set()
+    clipCount = 0
+    stack = []
+    sequenceStack = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = getLocalName(elem.tag)
+        if event == "start":
+            stack.append(elem)
+            if tag == "sequence":
+                attrs = dict((k.lower(), v) for k, v in elem.attrib.items())
+                rate = None
+                for name in frameRateNames:
+                    if name in attrs:
+                        rate = attrs[name]
+                        break
+
+                sequenceStack.append({"name": attrs.get("name", ""), "frameRate": rate, "trackItems": 0})
+            elif tag == "clip":
+                clipCount += 1
+            elif tag == "trackitem" and sequenceStack:
+                sequenceStack[-1]["trackItems"] += 1
+
+            if tag in mediaTags:
+                for key, value in elem.attrib.items():
+                    if key.lower() in mediaAttributes and value:
+                        mediaPaths.add(value)
+
+            continue
+
+        if tag in frameRateNames and sequenceStack and not sequenceStack[-1]["frameRate"]:
+            if elem.text and elem.text.strip():
+                sequenceStack[-1]["frameRate"] = elem.text.strip()
+        elif tag == "sequence" and sequenceStack:
+            sequences.append(sequenceStack.pop())
+
+        stack.pop()
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+    return {
+        "sequences": sequences,
+        "clipCount": clipCount,
+        "mediaPaths": sorted(mediaPaths),
+    }
+
+
+def formatMetadata(metadata, maxSequences=10):
+    """Returns a short summary of the metadata for the Project Browser."""
+    lines = []
+    sequences = metadata["sequences"]
+    lines.append("%s sequences" % len(sequences))
+    for sequence in sequences[:maxSequences]:
+        details = ["%s track items" % sequence["trackItems"]]
+        if sequence["frameRate"]:
+            details.insert(0, "%s fps" % sequence["frameRate"])
+
+        lines.append("    %s (%s)" % (sequence["name"] or "unnamed", ", ".join(details)))
+
+    if len(sequences) > maxSequences:
+        lines.append("    ...")
+
+    lines.append("%s clips" % metadata["clipCount"])
+    lines.append("%s media files" % len(metadata["mediaPaths"]))
+    return "\n".join(lines)
+
+
+class Prism_Hiero_MetadataCache(object):
+    """Caches the metadata of scene files on disk, keyed by the path, mtime
+    and size of the file."""
+
+    def __init__(self, cacheDir=None):
+        self.cacheDir = cacheDir
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def getCacheFile(self, path):
+        if not self.cacheDir:
+            self.cacheDir = getCacheDir("metadata")
+
+        pathHash = hashlib.md5(os.path.normcase(os.path.abspath(path)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cacheDir, pathHash + ".json")
+
+    def getMetadata(self, path):
+        fileStat = os.stat(path)
+        key = [cacheVersion, fileStat.st_mtime, fileStat.st_size]
+        entry = self.entries.get(path)
+        if entry is None:
+            entry = readJson(self.getCacheFile(path))
+
+        if entry and entry.get("key") == key:
+            self.stats["hits"] += 1
+            self.entries[path] = entry
+            return entry["data"]
+
+        self.stats["misses"] += 1
+        data = readMetadata(path)
+        entry = {"key": key, "path": path, "data": data}
+        self.entries[path] = entry
+        try:
+            writeJson(self.getCacheFile(path), entry)
+        except (IOError, OSError) as e:
+            logger.debug("failed to write metadata cache for %s: %s" % (path, e))
+
+        return data
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import time
+import logging
+import threading
+import collections
+
+from Prism_Hiero_Lazy import QtCore
+
+
+logger = logging.getLogger(__name__)
+
+
+class OpenContext(object):
+    def __init__(self, pipeline, generation, project, filepath):
+        self.pipeline = pipeline
+        self.generation = generation
+        self.project = project
+        self.filepath = filepath
+
+    def isCancelled(self):
+        return self.generation != self.pipeline.generation
+
+
+class Prism_Hiero_OpenPipeline(object):
+    """Runs the post-open steps of a project by priority. "immediate" steps
+    run right away, "idle" steps run one per event loop iteration on the
+    main thread and "thread" steps run on a worker thread. Opening another
+    project cancels all steps of the previous one which didn't start yet.
+    Steps get an OpenContext and must not touch Hiero objects if they run
+    on a thread."""
+
+    modes = ["immediate", "idle", "thread"]
+
+    def __init__(self, useEventLoop=True):
+        self.useEventLoop = useEventLoop
+        self.steps = []
+        self.generation = 0
+        self.timings = collections.deque(maxlen=200)
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def addStep(self, name, func, mode="immediate", priority=50):
+        if mode not in self.modes:
+            raise ValueError("Invalid mode: %s" % mode)
+
+        self.steps = [step for step in self.steps if step[0] != name]
+        self.steps.append((name, func, mode, priority))
+        self.steps.sort(key=lambda step: step[3])
+
+    def cancel(self):
+        with self.lock:
+            self.generation += 1
+
+    def run(self, project, filepath):
+        with self.lock:
+            self.generation += 1
+            context = OpenContext(self, self.generation, project, filepath)
+
+        idleSteps = []
+        threadSteps = []
+        for step in self.steps:
+            if step[2] == "immediate":
+                self.runStep(step, context)
+            elif step[2] == "idle":
+                idleSteps.append(step)
+            else:
+                threadSteps.append(step)
+
+        self.runThreadSteps(threadSteps, context)
+        self.runIdleSteps(idleSteps, context)
+        return context
+
+    def runIdleSteps(self, steps, context):
+        if not steps or context.isCancelled():
+            return
+
+        if not self.useEventLoop:
+            for step in steps:
+                self.runStep(step, context)
+
+            return
+
+        def runNext():
+            self.runStep(steps[0], context)
+            self.runIdleSteps(steps[1:], context)
+
+        QtCore.QTimer.singleShot(0, runNext)
+
+    def runThreadSteps(self, steps, context):
+        if not steps:
+            return
+
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=2)
+
+        for step in steps:
+            self.executor.submit(self.runStep, step, context)
+
+    def runStep(self, step, context):
+        name, func, mode, priority = step
+        timing = {
+            "step": name,
+            "mode": mode,
+            "path": context.filepath,
+            "time": 0.0,
+            "cancelled": context.isCancelled(),
+            "error": None,
+        }
+        if not timing["cancelled"]:
+            start = time.time()
+            try:
+                func(context)
+            except Exception as e:
+                timing["error"] = str(e)
+                logger.warning("post-open step %s failed: %s" % (name, e))
+
+            timing["time"] = time.time() - start
+
+        self.timings.append(timing)
+        logger.debug(
+            "post-open step %s (%s): %s"
+            % (name, mode, "cancelled" if timing["cancelled"] else "%.3fs" % timing["time"])
+        )
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import logging
+import threading
+
+from Prism_Hiero_Media import listDirectory
+from Prism_Hiero_Projects import normalizePath
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchJob(object):
+    def __init__(self, filepath, getMetadata, threads):
+        self.filepath = filepath
+        self.getMetadata = getMetadata
+        self.threads = threads
+        self.created = time.time()
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.listings = {}
+        self.metadata = None
+        self.callbacks = []
+        self.callbackLock = threading.Lock()
+        self.readEnd = None
+        self.openStart = None
+        self.stats = {
+            "bytes": 0,
+            "readTime": 0.0,
+            "directories": 0,
+            "listTime": 0.0,
+            "listEnds": [],
+            "wallTime": 0.0,
+        }
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def isCancelled(self):
+        return self.cancelled.is_set()
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name="PrismHieroPrefetch")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def run(self):
+        start = time.time()
+        try:
+            self.readFile()
+            if not self.isCancelled():
+                self.listDirectories()
+        except Exception as e:
+            logger.debug("prefetch of %s failed: %s" % (self.filepath, e))
+        finally:
+            self.stats["wallTime"] = time.time() - start
+            with self.callbackLock:
+                self.done.set()
+                callbacks, self.callbacks = self.callbacks, []
+
+            for callback in callbacks:
+                self.runCallback(callback)
+
+    def addCallback(self, callback):
+        """Calls callback with the job once it is done, on the prefetch
+        thread, or right away if it is done already."""
+        with self.callbackLock:
+            if not self.done.is_set():
+                self.callbacks.append(callback)
+                return
+
+        self.runCallback(callback)
+
+    def runCallback(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            logger.debug("prefetch callback failed: %s" % e)
+
+    def readFile(self):
+        # large sequential reads, so the open is served from the page cache
+        start = time.time()
+        with open(self.filepath, "rb") as f:
+            while not self.isCancelled():
+                data = f.read(Prism_Hiero_Prefetcher.chunkSize)
+                if not data:
+                    break
+
+                self.stats["bytes"] += len(data)
+
+        self.readEnd = time.time()
+        self.stats["readTime"] = self.readEnd - start
+
+    def listDirectory(self, directory):
+        if self.isCancelled():
+            return directory, None, 0.0
+
+        start = time.time()
+        listing = listDirectory(directory)
+        return directory, listing, time.time() - start
+
+    def listDirectories(self):
+        metadata = self.getMetadata(self.filepath)
+        if not metadata or self.isCancelled():
+            return
+
+        self.metadata = metadata
+
+        directories = sorted(set(os.path.dirname(path) for path in metadata["mediaPaths"]))
+        if not directories:
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            futures = [executor.submit(self.listDirectory, directory) for directory in directories]
+            for future in as_completed(futures):
+                directory, listing, elapsed = future.result()
+                if self.isCancelled():
+                    continue
+
+                self.listings[directory] = listing
+                self.stats["directories"] += 1
+                self.stats["listTime"] += elapsed
+                self.stats["listEnds"].append((time.time(), elapsed))
+
+    def getReport(self):
+        """Returns the prefetch work which finished before the open started,
+        which is the I/O the open didn't have to wait for."""
+        openStart = self.openStart or time.time()
+        aheadRead = self.stats["readTime"] if self.readEnd and self.readEnd <= openStart else 0.0
+        aheadList = sum(elapsed for end, elapsed in self.stats["listEnds"] if end <= openStart)
+        return {
+            "path": self.filepath,
+            "bytes": self.stats["bytes"],
+            "readTime": self.stats["readTime"],
+            "directories": self.stats["directories"],
+            "listTime": self.stats["listTime"],
+            "wallTime": self.stats["wallTime"],
+            "leadTime": openStart - self.created,
+            "saved": aheadRead + aheadList,
+            "cancelled": self.isCancelled(),
+        }
+
+
+class Prism_Hiero_Prefetcher(object):
+    """Warms the caches a project open depends on before Hiero opens it.
+
+    A prefetch reads the .hrox file with large sequential reads, gets the
+    referenced media directories from the scene metadata and lists them on
+    a thread pool. Starting a prefetch for another file cancels the running
+    one. The directory listings are kept for the media check after the
+    open. Prefetches older than maxAge seconds are started again."""
+
+    chunkSize = 8 * 1024 * 1024
+
+    def __init__(self, getMetadata, threads=16, maxAge=60):
+        self.getMetadata = getMetadata
+        self.threads = threads
+        self.maxAge = maxAge
+        self.job = None
+        self.lastReport = None
+        self.lock = threading.Lock()
+
+    def getJob(self, filepath):
+        job = self.job
+        if job and normalizePath(job.filepath) == normalizePath(filepath) and not job.isCancelled():
+            return job
+
+        return None
+
+    def prefetch(self, filepath):
+        if not os.path.isfile(filepath):
+            return None
+
+        with self.lock:
+            job = self.getJob(filepath)
+            if job and time.time() - job.created < self.maxAge:
+                return job
+
+            if self.job:
+                self.job.cancel()
+
+            self.job = PrefetchJob(filepath, self.getMetadata, self.threads)
+            self.job.start()
+            return self.job
+
+    def cancel(self):
+        with self.lock:
+            if self.job:
+                self.job.cancel()
+                self.job = None
+
+    def markOpened(self, filepath):
+        job = self.getJob(filepath)
+        if job and job.openStart is None:
+            job.openStart = time.time()
+
+        return job
+
+    def getListings(self, filepath):
+        job = self.getJob(filepath)
+        if not job or not job.done.is_set():
+            return None
+
+        return dict(job.listings)
+
+    def report(self, filepath, openTime):
+        job = self.getJob(filepath)
+        if not job:
+            return None
+
+        report = job.getReport()
+        report["openTime"] = openTime
+        self.lastReport = report
+        logger.info(
+            "prefetch of %s: read %.1f MB in %.3fs, parsed it and listed %s media directories in %.3fs "
+            "(%.3fs of listing), %.3fs of I/O finished before the open, which took %.3fs"
+            % (
+                filepath,
+                report["bytes"] / 1024.0 / 1024.0,
+                report["readTime"],
+                report["directories"],
+                report["wallTime"] - report["readTime"],
+                report["listTime"],
+                report["saved"],
+                openTime,
+            )
+        )
+        return report
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+import collections
+
+
+class Prism_Hiero_Profiler(object):
+    """Registry of call counts and timings of the plugin entry points.
+
+    Profiling is disabled by default and can be enabled with the
+    PRISM_HIERO_PROFILE environment variable or setEnabled. If
+    PRISM_HIERO_PROFILE_OUTPUT is set, the data gets exported to that path
+    on exit, as JSON or as a Chrome trace if PRISM_HIERO_PROFILE_FORMAT is
+    "chrome"."""
+
+    maxSamples = 10000
+    maxEvents = 100000
+
+    def __init__(self):
+        self.enabled = os.getenv("PRISM_HIERO_PROFILE", "") not in ["", "0"]
+        self.lock = threading.Lock()
+        self.origin = time.time()
+        self.reset()
+
+        output = os.getenv("PRISM_HIERO_PROFILE_OUTPUT")
+        if output:
+            atexit.register(self.export, output, os.getenv("PRISM_HIERO_PROFILE_FORMAT", "json"))
+
+    def reset(self):
+        with self.lock:
+            self.counts = collections.defaultdict(int)
+            self.totals = collections.defaultdict(float)
+            self.samples = collections.defaultdict(
+                lambda: collections.deque(maxlen=self.maxSamples)
+            )
+            self.events = collections.deque(maxlen=self.maxEvents)
+
+    def setEnabled(self, enabled):
+        self.enabled = enabled
+
+    def record(self, name, start, duration):
+        with self.lock:
+            self.counts[name] += 1
+            self.totals[name] += duration
+            self.samples[name].append(duration)
+            self.events.append((name, start, duration, threading.current_thread().ident))
+
+    def getStats(self):
+        with self.lock:
+            names = list(self.counts)
+            stats = {}
+            for name in names:
+                samples = sorted(self.samples[name])
+                stats[name] = {
+                    "count": self.counts[name],
+                    "total": self.totals[name],
+                    "mean": self.totals[name] / self.counts[name],
+                    "min": samples[0],
+                    "max": samples[-1],
+                    "p50": getPercentile(samples, 50),
+                    "p90": getPercentile(samples, 90),
+                    "p99": getPercentile(samples, 99),
+                }
+
+        return stats
+
+    def getChromeTrace(self):
+        with self.lock:
+            events = list(self.events)
+
+        pid = os.getpid()
+        traceEvents = []
+        for name, start, duration, tid in events:
+            traceEvents.append({
+                "name": name,
+                "cat": "PrismHiero",
+                "ph": "X",
+                "ts": (start - self.origin) * 1000000,
+                "dur": duration * 1000000,
+                "pid": pid,
+                "tid": tid,
+            })
+
+        return {"traceEvents": traceEvents, "displayTimeUnit": "ms"}
+
+    def export(self, path, fmt="json"):
+        if fmt == "chrome":
+            data = self.getChromeTrace()
+        else:
+            data = self.getStats()
+
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+        return path
+
+
+def getPercentile(samples, percentile):
+    if not samples:
+        return 0.0
+
+    idx = int(round(percentile / 100.0 * (len(samples) - 1)))
+    return samples[idx]
+
+
+profiler = Prism_Hiero_Profiler()
+
+
+def profiled(name=None):
+    """Records the wall time of the decorated function in the profiler if
+    profiling is enabled."""
+
+    def decorator(func):
+        recordName = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(recordName, start, time.time() - start)
+
+        return wrapper
+
+    return decorator
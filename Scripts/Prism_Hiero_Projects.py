@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import logging
+
+from Prism_Hiero_Lazy import hiero
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalizePath(path):
+    if not path:
+        return ""
+
+    return os.path.normcase(os.path.normpath(path))
+
+
+class Prism_Hiero_ProjectIndex(object):
+    """Index of the open Hiero projects by normalized path, kept up to date
+    through the Hiero project events."""
+
+    def __init__(self):
+        self.projects = None
+        self.registered = False
+        self.eventHandlers = [
+            ("kAfterNewProjectCreated", self.onProjectOpened),
+            ("kAfterProjectLoad", self.onProjectOpened),
+            ("kAfterProjectSave", self.onProjectSaved),
+            ("kBeforeProjectClose", self.onProjectClosed),
+        ]
+
+    def register(self):
+        if self.registered:
+            return
+
+        try:
+            for eventType, handler in self.eventHandlers:
+                hiero.core.events.registerInterest(eventType, handler)
+        except Exception as e:
+            logger.debug("failed to register project events: %s" % e)
+            self.unregister()
+            return
+
+        self.registered = True
+        self.projects = None
+
+    def unregister(self):
+        for eventType, handler in self.eventHandlers:
+            try:
+                hiero.core.events.unregisterInterest(eventType, handler)
+            except Exception:
+                pass
+
+        self.registered = False
+
+    def rebuild(self):
+        self.projects = {}
+        for project in hiero.core.projects():
+            self.addProject(project)
+
+    def getProjects(self):
+        # without the events the index can't be trusted, so it gets rebuilt
+        if self.projects is None or not self.registered:
+            self.rebuild()
+
+        return self.projects
+
+    def addProject(self, project):
+        if self.projects is None:
+            return
+
+        path = normalizePath(project.path())
+        if path:
+            self.projects[path] = project
+
+    def removePath(self, path):
+        if self.projects is not None:
+            self.projects.pop(normalizePath(path), None)
+
+    def getProject(self, path):
+        return self.getProjects().get(normalizePath(path))
+
+    def isOpen(self, path):
+        return normalizePath(path) in self.getProjects()
+
+    def getPaths(self):
+        return list(self.getProjects())
+
+    def onProjectOpened(self, event):
+        self.addProject(event.project)
+
+    def onProjectSaved(self, event):
+        # "save as" changes the path of the project without telling the old one
+        self.projects = None
+
+    def onProjectClosed(self, event):
+        self.removePath(event.project.path())
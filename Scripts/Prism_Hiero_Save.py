@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import tempfile
+import threading
+import queue
+import collections
+
+from Prism_Hiero_Lazy import nuke
+from Prism_Hiero_Projects import normalizePath
+from Prism_Hiero_Utils import readJson, writeJson
+import Prism_Hiero_Delta
+
+
+logger = logging.getLogger(__name__)
+
+stagingRoot = os.path.join(tempfile.gettempdir(), "PrismHiero", "saves")
+stagedVersionVar = "PRISM_HIERO_STAGED_VERSION"
+
+
+def getStagingPath(filepath):
+    folderHash = hashlib.md5(normalizePath(os.path.dirname(filepath)).encode("utf-8")).hexdigest()
+    return os.path.join(stagingRoot, folderHash, os.path.basename(filepath))
+
+
+def rebuildVersion(filepath):
+    """Rebuilds a delta version into its staging path, unless it is already
+    up to date there, and returns the staging path."""
+    stagingPath = getStagingPath(filepath)
+    if Prism_Hiero_Delta.isRebuilt(filepath, stagingPath):
+        # a fresh mtime keeps the staging cleanup away while Hiero opens it
+        os.utime(stagingPath, None)
+    else:
+        Prism_Hiero_Delta.rebuildFile(filepath, stagingPath)
+
+    return stagingPath
+
+
+def getStagedVersionEnvironment(stagingPath, filepath):
+    """Returns an environment for a Hiero process which is launched on the
+    rebuilt stagingPath, so the plugin in that process maps it back to
+    filepath."""
+    env = dict(os.environ)
+    env[stagedVersionVar] = json.dumps([stagingPath, filepath])
+    return env
+
+
+class Prism_Hiero_AsyncSave(object):
+    """Saves projects to a local staging file on the UI thread and copies
+    them to their target path on a worker thread, or directly if the save
+    is synchronous. In delta mode the target is written as a delta against
+    a previous version.
+
+    Hiero keeps the staging path as the project path, also in its recent
+    files, so the staging files are mapped back to their targets and later
+    saves of a staged project are uploaded as well. The mapping and the
+    uploaded state of each staging file are kept in an index next to the
+    staging files, so they survive a restart and are shared between
+    sessions.
+
+    A staging file is only deleted once the index shows that its current
+    content was uploaded and it is no longer the path of an open project.
+    Files of other sessions are kept for stagingMaxAge seconds on top of
+    that. The open project paths are collected on the main thread whenever
+    a save starts, as the worker must not call into Hiero."""
+
+    chunkSize = 4 * 1024 * 1024
+    stagingGrace = 60
+    stagingMaxAge = 24 * 60 * 60
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.stagingRoot = stagingRoot
+        self.indexPath = os.path.join(stagingRoot, "index.json")
+        self.indexMtime = None
+        self.indexLock = threading.RLock()
+        self.targets = {}
+        self.ownFiles = set()
+        self.uploaded = {}
+        self.pending = set()
+        self.failed = set()
+        self.openPaths = frozenset()
+        self.status = {}
+        self.timings = collections.deque(maxlen=100)
+        self.keyframeInterval = 10
+        self.lastVersion = (None, None)
+        self.saving = False
+        self.queue = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+        self.loadIndex()
+        self.addStagedVersion()
+        atexit.register(self.wait, 60)
+
+    def getStagingPath(self, filepath):
+        return getStagingPath(filepath)
+
+    def getTargetPath(self, stagingPath):
+        normPath = normalizePath(stagingPath)
+        if normPath not in self.targets and normPath.startswith(normalizePath(self.stagingRoot)):
+            # another session may have staged the project
+            self.loadIndex()
+
+        return self.targets.get(normPath)
+
+    def addTarget(self, stagingPath, filepath):
+        normPath = normalizePath(stagingPath)
+        self.ownFiles.add(normPath)
+        if self.targets.get(normPath) != filepath:
+            self.updateIndex(targets={normPath: filepath})
+
+    def loadIndex(self):
+        with self.indexLock:
+            try:
+                mtime = os.path.getmtime(self.indexPath)
+            except OSError:
+                return
+
+            if mtime == self.indexMtime:
+                return
+
+            data = readJson(self.indexPath) or {}
+            self.targets.update(data.get("targets", {}))
+            self.uploaded.update(data.get("uploaded", {}))
+            self.indexMtime = mtime
+
+    def updateIndex(self, targets=None, uploaded=None, removed=None):
+        """Merges the changes into the index on disk, which other sessions
+        may have changed in the meantime."""
+        with self.indexLock:
+            data = readJson(self.indexPath) or {}
+            for key, values in [("targets", targets), ("uploaded", uploaded)]:
+                data.setdefault(key, {}).update(values or {})
+                for normPath in removed or []:
+                    data[key].pop(normPath, None)
+
+            self.targets.update(data["targets"])
+            self.uploaded.update(data["uploaded"])
+            for normPath in removed or []:
+                self.targets.pop(normPath, None)
+                self.uploaded.pop(normPath, None)
+
+            try:
+                if not os.path.exists(self.stagingRoot):
+                    os.makedirs(self.stagingRoot)
+
+                writeJson(self.indexPath, data)
+                self.indexMtime = os.path.getmtime(self.indexPath)
+            except (IOError, OSError) as e:
+                logger.warning("failed to write the staging index: %s" % e)
+
+    def setUploaded(self, stagingPath, mtime):
+        self.updateIndex(uploaded={normalizePath(stagingPath): mtime})
+
+    def isUploaded(self, stagingPath):
+        try:
+            mtime = os.path.getmtime(stagingPath)
+        except OSError:
+            return False
+
+        return self.uploaded.get(normalizePath(stagingPath)) == mtime
+
+    def updateOpenPaths(self):
+        # main thread only, the worker reads the last snapshot
+        self.openPaths = frozenset(
+            normalizePath(path) for path in self.plugin.getOpenProjectPaths() or []
+        )
+
+    def addStagedVersion(self):
+        stagedVersion = os.environ.pop(stagedVersionVar, None)
+        if not stagedVersion:
+            return
+
+        try:
+            stagingPath, filepath = json.loads(stagedVersion)
+        except ValueError:
+            logger.warning("invalid staged version: %s" % stagedVersion)
+            return
+
+        self.addTarget(stagingPath, filepath)
+        self.setRebuilt(stagingPath)
+
+    def setRebuilt(self, stagingPath):
+        # a rebuilt version matches its target, so it counts as uploaded
+        try:
+            self.setUploaded(stagingPath, os.path.getmtime(stagingPath))
+        except OSError:
+            pass
+
+    def save(self, project, filepath, basePath=None, synchronous=False):
+        start = time.time()
+        stagingPath = self.getStagingPath(filepath)
+        if not os.path.exists(os.path.dirname(stagingPath)):
+            os.makedirs(os.path.dirname(stagingPath))
+
+        self.saving = True
+        try:
+            project.saveAs(stagingPath)
+        finally:
+            self.saving = False
+
+        self.addTarget(stagingPath, filepath)
+        self.updateOpenPaths()
+        if synchronous:
+            self.status[filepath] = {"state": "queued", "progress": 0.0, "error": None}
+            self.pending.add(normalizePath(stagingPath))
+            self.upload(stagingPath, filepath, start, time.time() - start, basePath)
+            return self.status[filepath]["state"] == "done"
+
+        self.enqueue(stagingPath, filepath, start, time.time() - start, basePath)
+        return True
+
+    def openVersion(self, filepath):
+        """Rebuilds a delta version into its staging path and returns the path
+        Hiero should open."""
+        if not Prism_Hiero_Delta.isDeltaFile(filepath):
+            return filepath
+
+        stagingPath = rebuildVersion(filepath)
+        self.addTarget(stagingPath, filepath)
+        self.setRebuilt(stagingPath)
+        self.openPaths = self.openPaths | frozenset([normalizePath(stagingPath)])
+        return stagingPath
+
+    def enqueue(self, stagingPath, filepath, start, serializeTime, basePath=None):
+        with self.lock:
+            self.status[filepath] = {"state": "queued", "progress": 0.0, "error": None}
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.run, name="PrismHieroSave")
+                self.worker.daemon = True
+                self.worker.start()
+
+        self.pending.add(normalizePath(stagingPath))
+        self.queue.put((stagingPath, filepath, start, serializeTime, basePath))
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self.upload(*job)
+            except Exception as e:
+                logger.warning("unexpected error in the save worker: %s" % e)
+            finally:
+                self.queue.task_done()
+
+    def upload(self, stagingPath, filepath, start, serializeTime, basePath=None):
+        try:
+            stagingMtime = os.path.getmtime(stagingPath)
+        except OSError:
+            stagingMtime = None
+
+        try:
+            self.uploadFile(stagingPath, filepath, start, serializeTime, basePath)
+        finally:
+            self.pending.discard(normalizePath(stagingPath))
+
+        if self.status[filepath]["state"] == "done":
+            self.failed.discard(normalizePath(stagingPath))
+            if stagingMtime is not None:
+                self.setUploaded(stagingPath, stagingMtime)
+
+            if not self.isStagingInUse(stagingPath):
+                self.removeStagingFile(stagingPath)
+        else:
+            self.failed.add(normalizePath(stagingPath))
+
+        self.cleanupStaging()
+
+    def uploadFile(self, stagingPath, filepath, start, serializeTime, basePath=None):
+        uploadStart = time.time()
+        partPath = filepath + ".part"
+        self.status[filepath]["state"] = "uploading"
+        kind = "full"
+        try:
+            targetDir = os.path.dirname(filepath)
+            if targetDir and not os.path.exists(targetDir):
+                os.makedirs(targetDir)
+
+            if basePath:
+                kind, written = self.writeDelta(stagingPath, filepath, basePath)
+            else:
+                written = self.copyFile(stagingPath, filepath, partPath)
+        except Exception as e:
+            if os.path.exists(partPath):
+                try:
+                    os.remove(partPath)
+                except OSError:
+                    pass
+
+            self.reportFailure(filepath, e)
+            return
+
+        uploadTime = time.time() - uploadStart
+        timing = {
+            "path": filepath,
+            "type": kind,
+            "bytes": written,
+            "serialize": serializeTime,
+            "upload": uploadTime,
+            "total": time.time() - start,
+        }
+        self.timings.append(timing)
+        self.status[filepath].update({"state": "done", "progress": 1.0})
+        logger.debug(
+            "saved %s (%s, %s bytes): serialize %.3fs, upload %.3fs"
+            % (filepath, kind, written, serializeTime, uploadTime)
+        )
+
+    def writeDelta(self, stagingPath, filepath, basePath):
+        with open(stagingPath, "rb") as f:
+            data = f.read()
+
+        baseData = None
+        if self.lastVersion[0] == normalizePath(basePath):
+            baseData = self.lastVersion[1]
+
+        result = Prism_Hiero_Delta.writeVersion(
+            filepath,
+            data,
+            basePath=basePath,
+            baseData=baseData,
+            keyframeInterval=self.keyframeInterval,
+        )
+        self.lastVersion = (normalizePath(filepath), data)
+        return result
+
+    def copyFile(self, stagingPath, filepath, partPath):
+        if self.lastVersion[0] == normalizePath(filepath):
+            self.lastVersion = (None, None)
+
+        if os.path.exists(filepath):
+            Prism_Hiero_Delta.protectDependents(filepath)
+
+        size = os.path.getsize(stagingPath)
+        written = 0
+        with open(stagingPath, "rb") as src, open(partPath, "wb") as dst:
+            while True:
+                data = src.read(self.chunkSize)
+                if not data:
+                    break
+
+                dst.write(data)
+                written += len(data)
+                self.reportProgress(filepath, float(written) / size if size else 1.0)
+
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        os.replace(partPath, filepath)
+        return written
+
+    def isStagingInUse(self, stagingPath):
+        normPath = normalizePath(stagingPath)
+        return (
+            normPath in self.pending
+            or normPath in self.failed
+            or normPath in self.openPaths
+            or not self.isUploaded(stagingPath)
+        )
+
+    def removeStagingFile(self, stagingPath):
+        try:
+            os.remove(stagingPath)
+        except OSError:
+            return
+
+        self.updateIndex(removed=[normalizePath(stagingPath)])
+
+        try:
+            os.rmdir(os.path.dirname(stagingPath))
+        except OSError:
+            pass
+
+    def cleanupStaging(self):
+        """Removes staging files which are not in use. Files of this session
+        are kept for stagingGrace seconds, as a rebuilt version is written
+        right before Hiero opens it."""
+        if not os.path.isdir(self.stagingRoot):
+            return
+
+        self.loadIndex()
+
+        now = time.time()
+        for folder in os.listdir(self.stagingRoot):
+            folderPath = os.path.join(self.stagingRoot, folder)
+            if not os.path.isdir(folderPath):
+                continue
+
+            for name in os.listdir(folderPath):
+                path = os.path.join(folderPath, name)
+                try:
+                    age = now - os.path.getmtime(path)
+                except OSError:
+                    continue
+
+                ownFile = normalizePath(path) in self.ownFiles
+                if age < (self.stagingGrace if ownFile else self.stagingMaxAge):
+                    continue
+
+                if not self.isStagingInUse(path):
+                    self.removeStagingFile(path)
+
+    def reportProgress(self, filepath, progress):
+        self.status[filepath]["progress"] = progress
+
+    def reportFailure(self, filepath, error):
+        self.status[filepath].update({"state": "failed", "error": str(error)})
+        stagingPath = self.getStagingPath(filepath)
+        msg = (
+            "Failed to save the project to:\n\n%s\n\n%s\n\nThe project is still available locally:\n\n%s"
+            % (filepath, error, stagingPath)
+        )
+        logger.warning(msg)
+        if self.core.uiAvailable:
+            nuke.executeInMainThread(self.core.popup, args=(msg,))
+
+    def wait(self, timeout=None):
+        # Queue.join has no timeout, so poll the unfinished task count
+        end = None if timeout is None else time.time() + timeout
+        while self.queue.unfinished_tasks:
+            if end is not None and time.time() > end:
+                return False
+
+            time.sleep(0.05)
+
+        return True
+
+    def onProjectSaved(self, event):
+        if self.saving:
+            return
+
+        stagingPath = event.project.path()
+        filepath = self.getTargetPath(stagingPath)
+        if filepath:
+            self.updateOpenPaths()
+            self.enqueue(stagingPath, filepath, time.time(), 0.0)
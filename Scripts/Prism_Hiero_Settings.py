@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class Prism_Hiero_Settings(object):
+    """In-memory view of the "hiero" section of the Prism user config.
+
+    The section is read once and converted to the types of the defaults.
+    It is read again after invalidate(), which the plugin calls when the
+    Prism settings are saved, or when the modification time of the user
+    config changed. The modification time is checked at most every
+    checkInterval seconds, so frequent lookups don't touch the config
+    file."""
+
+    defaults = {
+        "usenukestudio": False,
+        "asyncsave": False,
+        "deltasave": False,
+        "deltakeyframeinterval": 0,
+        "validatemedia": True,
+        "launcherpool": False,
+        "synctimeline": False,
+        "thumbnails": True,
+        "autosave": True,
+        "autosaveinterval": 0,
+    }
+
+    def __init__(self, core, checkInterval=5.0):
+        self.core = core
+        self.checkInterval = checkInterval
+        self.values = None
+        self.mtime = None
+        self.lastCheck = 0
+        self.lock = threading.Lock()
+        self.stats = {"loads": 0, "checks": 0, "queries": 0}
+
+    def getConfigMtime(self):
+        try:
+            return os.path.getmtime(self.core.userini)
+        except (AttributeError, OSError, TypeError):
+            return None
+
+    def convert(self, section):
+        values = dict(self.defaults)
+        for key, value in (section or {}).items():
+            default = self.defaults.get(key)
+            if value is None:
+                continue
+
+            try:
+                if isinstance(default, bool):
+                    values[key] = bool(value)
+                elif isinstance(default, int):
+                    values[key] = int(value)
+                else:
+                    values[key] = value
+            except (TypeError, ValueError):
+                logger.warning("invalid value for the hiero setting %s: %s" % (key, value))
+
+        return values
+
+    def load(self):
+        self.stats["loads"] += 1
+        self.mtime = self.getConfigMtime()
+        self.lastCheck = time.time()
+        self.values = self.convert(self.core.getConfig("hiero"))
+
+    def update(self, section):
+        """Sets the values from an already loaded settings section."""
+        with self.lock:
+            self.values = self.convert(section)
+            self.mtime = self.getConfigMtime()
+            self.lastCheck = time.time()
+
+    def invalidate(self):
+        with self.lock:
+            self.values = None
+
+    def isStale(self):
+        if time.time() - self.lastCheck < self.checkInterval:
+            return False
+
+        self.stats["checks"] += 1
+        self.lastCheck = time.time()
+        return self.getConfigMtime() != self.mtime
+
+    def get(self, key):
+        with self.lock:
+            self.stats["queries"] += 1
+            if self.values is None or self.isStale():
+                self.load()
+
+            return self.values.get(key)
+
+    def __getitem__(self, key):
+        return self.get(key)
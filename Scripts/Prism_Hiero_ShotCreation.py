@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class Prism_Hiero_ShotCreator(object):
+    """Creates the Prism shots of a Hiero sequence in one batch. The shot
+    names and ranges come from the shot index in one pass and the existing
+    shots are checked on a thread pool. New shots are created through
+    Prism's entity API, so the project's folder structure and the
+    onShotCreated callbacks apply, and the ranges of all new shots are
+    written with a single config write.
+
+    Shots are created one by one on the calling thread, as the entity API
+    and the plugins hooked into its callbacks aren't thread safe."""
+
+    def __init__(self, plugin, threads=None):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.threads = threads or min(32, (os.cpu_count() or 1) * 4)
+        self.timings = {}
+
+    def getShots(self, sequence):
+        shots = []
+        for (sequenceName, shotName), contexts in sorted(
+            self.plugin.shotIndex.getShots(sequence).items()
+        ):
+            if not shotName:
+                continue
+
+            entityName = self.plugin.getShotEntityName(sequenceName, shotName)
+            shots.append({
+                "name": entityName,
+                "path": self.plugin.getShotPath(entityName),
+                "frameRange": [
+                    min(context["frameRange"][0] for context in contexts),
+                    max(context["frameRange"][1] for context in contexts),
+                ],
+                "items": len(contexts),
+            })
+
+        return shots
+
+    def checkShot(self, shot):
+        return shot["name"], os.path.isdir(shot["path"])
+
+    def createShot(self, shot):
+        # the range is left out here and written for all shots at once
+        try:
+            result = self.core.entities.createEntity("shot", shot["name"], silent=True)
+        except Exception as e:
+            return shot["name"], str(e)
+
+        if not result:
+            return shot["name"], "Prism didn't create the shot"
+
+        return shot["name"], None
+
+    def runParallel(self, func, shots):
+        if not shots:
+            return []
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            return list(executor.map(func, shots))
+
+    def execute(self, sequence, dryRun=False):
+        self.timings = {}
+
+        start = time.time()
+        shots = self.getShots(sequence)
+        self.timings["collect"] = time.time() - start
+
+        start = time.time()
+        existing = set(name for name, exists in self.runParallel(self.checkShot, shots) if exists)
+        newShots = [shot for shot in shots if shot["name"] not in existing]
+        self.timings["check"] = time.time() - start
+
+        result = {
+            "shots": shots,
+            "created": [],
+            "existing": sorted(existing),
+            "failed": {},
+            "dryRun": dryRun,
+            "timings": self.timings,
+        }
+        if dryRun:
+            result["created"] = [shot["name"] for shot in newShots]
+            return result
+
+        start = time.time()
+        for name, error in [self.createShot(shot) for shot in newShots]:
+            if error:
+                result["failed"][name] = error
+            else:
+                result["created"].append(name)
+
+        self.timings["create"] = time.time() - start
+
+        start = time.time()
+        ranges = dict(
+            (shot["name"], shot["frameRange"])
+            for shot in newShots
+            if shot["name"] not in result["failed"]
+        )
+        if ranges:
+            self.plugin.setShotRanges(ranges)
+
+        self.timings["ranges"] = time.time() - start
+
+        logger.debug(
+            "shot creation: %s shots, %s created, %s existing, %s failed, timings: %s"
+            % (
+                len(shots),
+                len(result["created"]),
+                len(result["existing"]),
+                len(result["failed"]),
+                ", ".join("%s %.3fs" % (k, v) for k, v in self.timings.items()),
+            )
+        )
+        for name in sorted(result["failed"]):
+            logger.warning("failed to create shot %s: %s" % (name, result["failed"][name]))
+
+        return result
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import time
+import logging
+import threading
+
+from Prism_Hiero_Lazy import hiero
+
+
+logger = logging.getLogger(__name__)
+
+
+def getObjectKey(obj):
+    try:
+        return obj.guid()
+    except Exception:
+        return id(obj)
+
+
+def getItemSignature(item):
+    return (
+        item.name(),
+        item.timelineIn(),
+        item.timelineOut(),
+        item.sourceIn(),
+        item.sourceOut(),
+    )
+
+
+class Prism_Hiero_ShotIndex(object):
+    """Maps the track items of Hiero sequences to Prism shots.
+
+    A sequence is indexed on its first query. Later queries use the index
+    until a sequence edit event arrives, then only track items whose name
+    or range changed are parsed again. Without the events every query
+    compares the item signatures, which still avoids parsing unchanged
+    items."""
+
+    eventTypes = ["kSequenceEdited", "kAfterProjectSave"]
+
+    def __init__(self, parseName):
+        self.parseName = parseName
+        self.sequences = {}
+        self.registered = False
+        self.lock = threading.RLock()
+        self.stats = {"builds": 0, "updates": 0, "parsed": 0, "queries": 0}
+
+    def register(self):
+        if self.registered:
+            return
+
+        for eventType in self.eventTypes:
+            try:
+                hiero.core.events.registerInterest(eventType, self.onEvent)
+                self.registered = True
+            except Exception as e:
+                logger.debug("failed to register %s: %s" % (eventType, e))
+
+    def unregister(self):
+        for eventType in self.eventTypes:
+            try:
+                hiero.core.events.unregisterInterest(eventType, self.onEvent)
+            except Exception:
+                pass
+
+        self.registered = False
+
+    def onEvent(self, event=None):
+        sequence = getattr(event, "sequence", None)
+        if sequence is not None and not callable(sequence):
+            self.invalidate(sequence)
+        else:
+            self.invalidate()
+
+    def invalidate(self, sequence=None):
+        with self.lock:
+            if sequence is None:
+                for entry in self.sequences.values():
+                    entry["dirty"] = True
+            elif getObjectKey(sequence) in self.sequences:
+                self.sequences[getObjectKey(sequence)]["dirty"] = True
+
+    def clear(self):
+        with self.lock:
+            self.sequences = {}
+
+    def createContext(self, sequence, track, item):
+        name, timelineIn, timelineOut, sourceIn, sourceOut = getItemSignature(item)
+        sequenceName, shotName = self.parseName(name)
+        return {
+            "item": name,
+            "track": track.name(),
+            "sequence": sequenceName,
+            "shot": shotName,
+            "hieroSequence": sequence.name(),
+            "timelineIn": timelineIn,
+            "timelineOut": timelineOut,
+            "frameRange": [sourceIn, sourceOut],
+        }
+
+    def getEntry(self, sequence):
+        key = getObjectKey(sequence)
+        entry = self.sequences.get(key)
+        if entry is None:
+            entry = {"items": {}, "shots": {}, "dirty": True}
+            self.sequences[key] = entry
+            self.stats["builds"] += 1
+        elif not entry["dirty"] and self.registered:
+            return entry
+        else:
+            self.stats["updates"] += 1
+
+        self.update(sequence, entry)
+        return entry
+
+    def update(self, sequence, entry):
+        items = entry["items"]
+        shots = entry["shots"]
+        seen = set()
+        for track in sequence.videoTracks():
+            for item in track.items():
+                itemKey = getObjectKey(item)
+                seen.add(itemKey)
+                signature = getItemSignature(item)
+                cached = items.get(itemKey)
+                if cached and cached[0] == signature:
+                    continue
+
+                if cached:
+                    self.removeShotItem(shots, cached[1], itemKey)
+
+                context = self.createContext(sequence, track, item)
+                items[itemKey] = (signature, context)
+                shots.setdefault((context["sequence"], context["shot"]), []).append(itemKey)
+                self.stats["parsed"] += 1
+
+        for itemKey in [key for key in items if key not in seen]:
+            self.removeShotItem(shots, items.pop(itemKey)[1], itemKey)
+
+        entry["dirty"] = False
+
+    def removeShotItem(self, shots, context, itemKey):
+        shotKey = (context["sequence"], context["shot"])
+        if itemKey in shots.get(shotKey, []):
+            shots[shotKey].remove(itemKey)
+            if not shots[shotKey]:
+                del shots[shotKey]
+
+    def getContext(self, item, sequence=None):
+        self.stats["queries"] += 1
+        sequence = sequence or item.parentSequence()
+        with self.lock:
+            entry = self.getEntry(sequence)
+            cached = entry["items"].get(getObjectKey(item))
+            return dict(cached[1]) if cached else None
+
+    def getShots(self, sequence):
+        """Returns {(sequenceName, shotName): [context, ...]} for all track
+        items of the sequence."""
+        self.stats["queries"] += 1
+        with self.lock:
+            entry = self.getEntry(sequence)
+            items = entry["items"]
+            return dict(
+                (shotKey, [dict(items[itemKey][1]) for itemKey in itemKeys])
+                for shotKey, itemKeys in entry["shots"].items()
+            )
+
+    def build(self, sequences):
+        start = time.time()
+        with self.lock:
+            for sequence in sequences:
+                self.getEntry(sequence)
+
+        logger.debug(
+            "indexed %s sequences in %.3fs" % (len(sequences), time.time() - start)
+        )
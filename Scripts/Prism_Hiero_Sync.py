@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import hashlib
+import logging
+
+from Prism_Hiero_Utils import getCacheDir, readJson, writeJson
+
+
+logger = logging.getLogger(__name__)
+
+
+class Prism_Hiero_TimelineSync(object):
+    """Pushes shot range changes of a Hiero sequence to Prism.
+
+    The sequence is reduced to a snapshot of {shot: {frameRange, cut}}
+    through the shot index and compared with the snapshot of the last sync
+    of the Prism project, which is kept in memory and in the local cache
+    folder. Only the shots that changed since then and already exist in
+    Prism are written, with one config write per shotinfo category. Only
+    the written shots go into the snapshot, so shots which don't exist in
+    Prism yet are picked up by the first sync after they are created."""
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.core = plugin.core
+        self.snapshots = {}
+
+    def getSnapshotPath(self):
+        key = hashlib.sha1(self.core.fixPath(self.core.projectPath).encode("utf-8")).hexdigest()
+        return os.path.join(getCacheDir("timelineSync"), key + ".json")
+
+    def getLastSnapshot(self):
+        path = self.getSnapshotPath()
+        if path not in self.snapshots:
+            self.snapshots[path] = readJson(path) or {}
+
+        return self.snapshots[path]
+
+    def saveSnapshot(self, snapshot):
+        path = self.getSnapshotPath()
+        self.snapshots[path] = snapshot
+        try:
+            writeJson(path, snapshot)
+        except (IOError, OSError) as e:
+            logger.debug("failed to write the timeline snapshot %s: %s" % (path, e))
+
+    def createSnapshot(self, sequence):
+        snapshot = {}
+        for (sequenceName, shotName), contexts in self.plugin.shotIndex.getShots(sequence).items():
+            if not shotName:
+                continue
+
+            entityName = self.plugin.getShotEntityName(sequenceName, shotName)
+            snapshot[entityName] = {
+                "frameRange": [
+                    min(context["frameRange"][0] for context in contexts),
+                    max(context["frameRange"][1] for context in contexts),
+                ],
+                "cut": [
+                    min(context["timelineIn"] for context in contexts),
+                    max(context["timelineOut"] for context in contexts),
+                ],
+                "sequence": sequence.name(),
+            }
+
+        return snapshot
+
+    def sync(self, sequence):
+        start = time.time()
+        snapshot = self.createSnapshot(sequence)
+        lastSnapshot = self.getLastSnapshot()
+        changed = [
+            name for name in snapshot if snapshot[name] != lastSnapshot.get(name)
+        ]
+
+        result = {"shots": len(snapshot), "changed": len(changed), "updated": 0, "time": 0}
+        if changed:
+            knownShots = self.core.getConfig("shotRanges", config="shotinfo") or {}
+            updated = [name for name in changed if name in knownShots]
+            if updated:
+                self.plugin.updateShotInfo(
+                    "shotRanges", dict((name, snapshot[name]["frameRange"]) for name in updated)
+                )
+                self.plugin.updateShotInfo(
+                    "hieroTimeline",
+                    dict(
+                        (name, {"cut": snapshot[name]["cut"], "sequence": snapshot[name]["sequence"]})
+                        for name in updated
+                    ),
+                )
+
+            result["updated"] = len(updated)
+            if updated:
+                lastSnapshot = dict(lastSnapshot)
+                lastSnapshot.update(dict((name, snapshot[name]) for name in updated))
+                self.saveSnapshot(lastSnapshot)
+
+        result["time"] = time.time() - start
+        logger.info(
+            "timeline sync: %s shots, %s changed, %s updated in Prism in %.3fs"
+            % (result["shots"], result["changed"], result["updated"], result["time"])
+        )
+        return result
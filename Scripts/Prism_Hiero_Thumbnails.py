@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import time
+import hashlib
+import logging
+import threading
+
+from Prism_Hiero_Lazy import QtCore
+from Prism_Hiero_Utils import getCacheDir, readJson, writeJson
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalizeScenePath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def getPosterImage(sequence):
+    try:
+        frame = sequence.posterFrame()
+    except Exception:
+        frame = 0
+
+    return sequence.thumbnail(frame)
+
+
+def encodeImage(image, width=480, fmt="JPG", quality=85):
+    if image.width() > width:
+        image = image.scaledToWidth(width, QtCore.Qt.SmoothTransformation)
+
+    data = QtCore.QByteArray()
+    buf = QtCore.QBuffer(data)
+    buf.open(QtCore.QIODevice.WriteOnly)
+    image.save(buf, fmt, quality)
+    buf.close()
+    return bytes(data)
+
+
+def publishPreview(previewPath, data):
+    """Writes a preview to the path Prism's Project Browser reads it from.
+    Existing previews are kept, as they may have been set by the user."""
+    if os.path.exists(previewPath):
+        return False
+
+    tmpPath = "%s.%s.tmp" % (previewPath, os.getpid())
+    with open(tmpPath, "wb") as f:
+        f.write(data)
+
+    os.replace(tmpPath, previewPath)
+    return True
+
+
+class Prism_Hiero_ThumbnailCache(object):
+    """Stores scene previews in a local, content addressed disk cache.
+
+    Images are stored once per content hash and scene paths point to them,
+    so versions with the same poster frame share a file. When the cache
+    grows over maxSize bytes the least recently used images are removed
+    together with the scenes pointing to them. The index is reloaded when
+    another process changed it."""
+
+    def __init__(self, cacheDir=None, maxSize=200 * 1024 * 1024):
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.index = None
+        self.indexMtime = None
+        self.lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def getCacheDir(self):
+        if not self.cacheDir:
+            self.cacheDir = getCacheDir("thumbnails")
+
+        return self.cacheDir
+
+    def getIndexPath(self):
+        return os.path.join(self.getCacheDir(), "index.json")
+
+    def getBlobPath(self, key):
+        return os.path.join(self.getCacheDir(), key[:2], key + ".jpg")
+
+    def loadIndex(self):
+        try:
+            mtime = os.path.getmtime(self.getIndexPath())
+        except OSError:
+            mtime = None
+
+        if self.index is None or mtime != self.indexMtime:
+            self.index = readJson(self.getIndexPath()) or {"scenes": {}, "blobs": {}}
+            self.indexMtime = mtime
+
+        return self.index
+
+    def saveIndex(self):
+        try:
+            writeJson(self.getIndexPath(), self.index)
+            self.indexMtime = os.path.getmtime(self.getIndexPath())
+        except (IOError, OSError) as e:
+            logger.debug("failed to write the thumbnail index: %s" % e)
+
+    def add(self, scenePaths, data):
+        key = hashlib.sha1(data).hexdigest()
+        with self.lock:
+            index = self.loadIndex()
+            blobPath = self.getBlobPath(key)
+            if key not in index["blobs"] or not os.path.exists(blobPath):
+                if not os.path.exists(os.path.dirname(blobPath)):
+                    os.makedirs(os.path.dirname(blobPath))
+
+                tmpPath = "%s.%s.tmp" % (blobPath, os.getpid())
+                with open(tmpPath, "wb") as f:
+                    f.write(data)
+
+                os.replace(tmpPath, blobPath)
+                self.stats["stored"] += 1
+
+            index["blobs"][key] = [len(data), time.time()]
+            for scenePath in scenePaths:
+                index["scenes"][normalizeScenePath(scenePath)] = key
+
+            self.evict()
+            self.saveIndex()
+
+        return key
+
+    def evict(self):
+        blobs = self.index["blobs"]
+        total = sum(size for size, lastAccess in blobs.values())
+        if total <= self.maxSize:
+            return
+
+        removed = set()
+        for key in sorted(blobs, key=lambda k: blobs[k][1]):
+            if total <= self.maxSize:
+                break
+
+            total -= blobs[key][0]
+            removed.add(key)
+            try:
+                os.remove(self.getBlobPath(key))
+            except OSError:
+                pass
+
+        for key in removed:
+            del blobs[key]
+
+        self.index["scenes"] = dict(
+            (path, key) for path, key in self.index["scenes"].items() if key not in removed
+        )
+        self.stats["evicted"] += len(removed)
+
+    def getPath(self, scenePath):
+        with self.lock:
+            index = self.loadIndex()
+            key = index["scenes"].get(normalizeScenePath(scenePath))
+            blobPath = self.getBlobPath(key) if key else None
+            if not blobPath or not os.path.exists(blobPath):
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            entry = index["blobs"].get(key)
+            if entry and time.time() - entry[1] > 60:
+                # access times only need to be roughly right for the LRU order
+                entry[1] = time.time()
+                self.saveIndex()
+
+            return blobPath
+
+
+class Prism_Hiero_ThumbnailService(object):
+    """Generates scene previews after saves without blocking them.
+
+    A request only records the scene path and schedules a grab of the
+    poster frame on the main thread, at most once every minInterval
+    seconds. Requests arriving in between are merged into the next grab and
+    share its image. Scaling, encoding and writing the image to the cache
+    and to the preview path of the scene, where the Project Browser picks it
+    up, happen on a worker thread."""
+
+    def __init__(self, cache, minInterval=30, width=480, useEventLoop=True):
+        self.cache = cache
+        self.minInterval = minInterval
+        self.width = width
+        self.useEventLoop = useEventLoop
+        self.pending = []
+        self.getImage = None
+        self.scheduled = False
+        self.lastGrab = 0
+        self.executor = None
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "grabs": 0, "published": 0, "failed": 0}
+
+    def request(self, scenePath, getImage, previewPath=None):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.pending.append((scenePath, previewPath))
+            self.getImage = getImage
+            if self.scheduled:
+                return
+
+            self.scheduled = True
+            delay = max(0, self.minInterval - (time.time() - self.lastGrab))
+
+        if self.useEventLoop:
+            QtCore.QTimer.singleShot(int(delay * 1000), self.grab)
+        else:
+            self.grab()
+
+    def grab(self):
+        with self.lock:
+            requests, self.pending = self.pending, []
+            getImage, self.getImage = self.getImage, None
+            self.scheduled = False
+            self.lastGrab = time.time()
+
+        if not requests:
+            return
+
+        try:
+            image = getImage()
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.debug("failed to grab the poster frame: %s" % e)
+            return
+
+        self.stats["grabs"] += 1
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.executor.submit(self.store, requests, image)
+
+    def store(self, requests, image):
+        try:
+            data = encodeImage(image, width=self.width)
+            self.cache.add([scenePath for scenePath, previewPath in requests], data)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning("failed to store the preview of %s: %s" % (requests[-1][0], e))
+            return
+
+        for scenePath, previewPath in requests:
+            if not previewPath:
+                continue
+
+            try:
+                if publishPreview(previewPath, data):
+                    self.stats["published"] += 1
+            except (IOError, OSError) as e:
+                logger.debug("failed to write the preview of %s: %s" % (scenePath, e))
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
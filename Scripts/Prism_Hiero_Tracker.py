@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import time
+import logging
+
+from Prism_Hiero_Lazy import hiero, QtCore
+
+
+logger = logging.getLogger(__name__)
+
+
+class Prism_Hiero_CurrentFileTracker(object):
+    """Keeps the path of the current project in memory.
+
+    Hiero project and sequence events mark the path as outdated and start a
+    debounce timer, so a burst of events results in a single refresh. A
+    query refreshes the path only if an event arrived since the last
+    refresh or the path is older than maxAge seconds. Without the events
+    every query resolves the path again."""
+
+    eventTypes = [
+        "kAfterNewProjectCreated",
+        "kAfterProjectLoad",
+        "kAfterProjectSave",
+        "kAfterProjectClose",
+        "kPlaybackClipChanged",
+        "kPlaybackSrcChanged",
+        "kSelectionChanged",
+    ]
+
+    def __init__(self, resolvePath, debounce=50, maxAge=1.0):
+        self.resolvePath = resolvePath
+        self.debounce = debounce
+        self.maxAge = maxAge
+        self.path = ""
+        self.dirty = True
+        self.refreshTime = 0
+        self.registered = False
+        self.useEventLoop = True
+        self.timer = None
+        self.stats = {"events": 0, "refreshes": 0, "queries": 0}
+
+    def register(self):
+        if self.registered:
+            return
+
+        try:
+            for eventType in self.eventTypes:
+                hiero.core.events.registerInterest(eventType, self.onEvent)
+        except Exception as e:
+            logger.debug("failed to register current file events: %s" % e)
+            self.unregister()
+            return
+
+        self.registered = True
+        self.invalidate()
+
+    def unregister(self):
+        for eventType in self.eventTypes:
+            try:
+                hiero.core.events.unregisterInterest(eventType, self.onEvent)
+            except Exception:
+                pass
+
+        self.registered = False
+
+    def onEvent(self, event=None):
+        self.stats["events"] += 1
+        self.invalidate()
+        if self.useEventLoop:
+            self.scheduleRefresh()
+
+    def invalidate(self):
+        self.dirty = True
+
+    def scheduleRefresh(self):
+        if self.timer is None:
+            self.timer = QtCore.QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.setInterval(self.debounce)
+            self.timer.timeout.connect(self.refreshIfDirty)
+
+        self.timer.start()
+
+    def refreshIfDirty(self):
+        if self.dirty:
+            self.refresh()
+
+    def refresh(self):
+        self.dirty = False
+        self.path = self.resolvePath()
+        self.refreshTime = time.time()
+        self.stats["refreshes"] += 1
+        return self.path
+
+    def getPath(self):
+        self.stats["queries"] += 1
+        if (
+            not self.registered
+            or self.dirty
+            or time.time() - self.refreshTime > self.maxAge
+        ):
+            return self.refresh()
+
+        return self.path
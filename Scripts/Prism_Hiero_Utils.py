@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2020 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+#
+####################################################
+#
+# Modifed by EXPANSE team for internal pipeline usage
+#
+####################################################
+
+
+import os
+import json
+import platform
+
+
+def getCacheDir(*parts):
+    """Returns a folder for persistent local caches of the plugin."""
+    cacheRoot = os.getenv("PRISM_HIERO_CACHE")
+    if not cacheRoot:
+        if platform.system() == "Windows":
+            base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+        cacheRoot = os.path.join(base, "PrismHiero")
+
+    path = os.path.join(cacheRoot, *parts)
+    if not os.path.exists(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+
+    return path
+
+
+def readJson(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def writeJson(path, data):
+    tmpPath = "%s.%s.tmp" % (path, os.getpid())
+    with open(tmpPath, "w") as f:
+        json.dump(data, f)
+
+    os.replace(tmpPath, path)
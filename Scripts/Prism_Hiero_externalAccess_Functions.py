@@ -39,16 +39,9 @@
 import os
 import sys
 import platform
+import logging
 import subprocess
 
-try:
-    from PySide2.QtCore import *
-    from PySide2.QtGui import *
-    from PySide2.QtWidgets import *
-except:
-    from PySide.QtCore import *
-    from PySide.QtGui import *
-
 if platform.system() == "Windows":
     if sys.version[0] == "3":
         import winreg as _winreg
@@ -57,11 +50,30 @@ if platform.system() == "Windows":
 
 from PrismUtils.Decorators import err_catcher_plugin as err_catcher
 
+from Prism_Hiero_Lazy import QtWidgets, LazyAttribute
+from Prism_Hiero_Profiler import profiler, profiled
+from Prism_Hiero_Settings import Prism_Hiero_Settings
+
+
+logger = logging.getLogger(__name__)
+
 
 class Prism_Hiero_externalAccess_Functions(object):
+    settingsWidgets = [
+        ("usenukestudio", "chb_nukeStudio"),
+        ("asyncsave", "chb_hieroAsyncSave"),
+        ("deltasave", "chb_hieroDeltaSave"),
+        ("validatemedia", "chb_hieroValidateMedia"),
+        ("launcherpool", "chb_hieroLauncherPool"),
+        ("synctimeline", "chb_hieroSyncTimeline"),
+        ("thumbnails", "chb_hieroThumbnails"),
+        ("autosave", "chb_hieroAutosave"),
+    ]
+
     def __init__(self, core, plugin):
         self.core = core
         self.plugin = plugin
+        self.settings = Prism_Hiero_Settings(core)
         if self.core.version.startswith("v2"):
             self.core.registerCallback(
                 "prismSettings_saveSettings",
@@ -75,29 +87,92 @@ class Prism_Hiero_externalAccess_Functions(object):
             )
             self.core.registerCallback("getPresetScenes", self.getPresetScenes, plugin=self.plugin)
 
+    # the components below are created on first use, so their imports stay
+    # out of the startup of sessions which don't need them
+
+    @LazyAttribute
+    def metadataCache(self):
+        from Prism_Hiero_Metadata import Prism_Hiero_MetadataCache
+
+        return Prism_Hiero_MetadataCache()
+
+    @LazyAttribute
+    def thumbnailCache(self):
+        from Prism_Hiero_Thumbnails import Prism_Hiero_ThumbnailCache
+
+        return Prism_Hiero_ThumbnailCache()
+
     @err_catcher(name=__name__)
     def prismSettings_loadUI(self, origin, tab):
-        origin.chb_nukeStudio = QCheckBox("Use Nuke Studio instead of Hiero")
+        origin.chb_nukeStudio = QtWidgets.QCheckBox("Use Nuke Studio instead of Hiero")
         tab.layout().addWidget(origin.chb_nukeStudio)
+        origin.chb_hieroAsyncSave = QtWidgets.QCheckBox("Save versions in the background")
+        origin.chb_hieroAsyncSave.setToolTip(
+            "Saves the project to a local file first and copies it to the project in the background."
+        )
+        tab.layout().addWidget(origin.chb_hieroAsyncSave)
+        origin.chb_hieroDeltaSave = QtWidgets.QCheckBox("Save versions as deltas of the previous version")
+        origin.chb_hieroDeltaSave.setToolTip(
+            "Stores only the changes to the previous version, with a full version in regular intervals.\n"
+            "The deltas are computed in the background, so this requires saving versions in the background.\n"
+            "Opening a delta version rebuilds the full project first, which adds about half a second per\n"
+            "20 MB of project to the open. Delta versions can only be opened through Prism, not directly in Hiero."
+        )
+        origin.chb_hieroAsyncSave.toggled.connect(origin.chb_hieroDeltaSave.setEnabled)
+        origin.chb_hieroDeltaSave.setEnabled(origin.chb_hieroAsyncSave.isChecked())
+        tab.layout().addWidget(origin.chb_hieroDeltaSave)
+        origin.chb_hieroValidateMedia = QtWidgets.QCheckBox("Check media paths after opening a project")
+        origin.chb_hieroValidateMedia.setChecked(True)
+        tab.layout().addWidget(origin.chb_hieroValidateMedia)
+        origin.chb_hieroLauncherPool = QtWidgets.QCheckBox("Keep a pre-started Hiero process to open scenes")
+        origin.chb_hieroLauncherPool.setToolTip(
+            "Scenes opened from the Project Browser are sent to an idle Hiero process, which gets replaced in the background."
+        )
+        tab.layout().addWidget(origin.chb_hieroLauncherPool)
+        origin.chb_hieroSyncTimeline = QtWidgets.QCheckBox("Update Prism shot ranges from the timeline on save")
+        origin.chb_hieroSyncTimeline.setToolTip(
+            "Ranges of existing Prism shots which changed in the active sequence since the last save are written to Prism."
+        )
+        tab.layout().addWidget(origin.chb_hieroSyncTimeline)
+        origin.chb_hieroThumbnails = QtWidgets.QCheckBox("Create scene previews in the background after saving")
+        origin.chb_hieroThumbnails.setChecked(True)
+        tab.layout().addWidget(origin.chb_hieroThumbnails)
+        origin.chb_hieroAutosave = QtWidgets.QCheckBox("Keep a history of the project autosaves")
+        origin.chb_hieroAutosave.setToolTip(
+            "Copies Hiero's autosaves of edited projects to a local folder, which keeps the latest 10 of each project.\n"
+            "Autosave has to be enabled in Hiero's preferences."
+        )
+        origin.chb_hieroAutosave.setChecked(True)
+        tab.layout().addWidget(origin.chb_hieroAutosave)
 
     @err_catcher(name=__name__)
+    @profiled()
     def prismSettings_saveSettings(self, origin, settings):
         if "hiero" not in settings:
             settings["hiero"] = {}
 
-        settings["hiero"]["usenukestudio"] = origin.chb_nukeStudio.isChecked()
+        for key, widgetName in self.settingsWidgets:
+            settings["hiero"][key] = getattr(origin, widgetName).isChecked()
+
+        self.settings.update(settings["hiero"])
+        if hasattr(self, "invalidateRenderPathCache"):
+            self.invalidateRenderPathCache()
 
     @err_catcher(name=__name__)
+    @profiled()
     def prismSettings_loadSettings(self, origin, settings):
-        if "hiero" in settings:
-            if "usenukestudio" in settings["hiero"]:
-                origin.chb_nukeStudio.setChecked(settings["hiero"]["usenukestudio"])
-
+        section = settings.get("hiero") or {}
+        for key, widgetName in self.settingsWidgets:
+            if key in section:
+                getattr(origin, widgetName).setChecked(section[key])
 
+        self.settings.update(section)
 
     @err_catcher(name=__name__)
     def getAutobackPath(self, origin, tab):
-        autobackpath = ""
+        from Prism_Hiero_Autosave import getAutobackDir
+
+        autobackpath = getAutobackDir()
 
         fileStr = "Nuke Script ("
         for i in self.sceneFormats:
@@ -108,9 +183,10 @@ class Prism_Hiero_externalAccess_Functions(object):
         return autobackpath, fileStr
 
     @err_catcher(name=__name__)
+    @profiled()
     def customizeExecutable(self, origin, appPath, filepath):
         fileStarted = False
-        if self.core.getConfig("hiero", "usenukestudio"):
+        if self.settings.get("usenukestudio"):
             if appPath == "":
                 if not hasattr(self, "hieroPath"):
                     self.getHieroPath(origin)
@@ -118,14 +194,14 @@ class Prism_Hiero_externalAccess_Functions(object):
                 if self.hieroPath is not None and os.path.exists(self.hieroPath):
                     appPath = self.hieroPath
                 else:
-                    QMessageBox.warning(
+                    QtWidgets.QMessageBox.warning(
                         self.core.messageParent,
                         "Warning",
                         "Nuke executable doesn't exist:\n\n%s" % self.hieroPath,
                     )
 
             if appPath is not None and appPath != "":
-                subprocess.Popen([appPath, "--studio", self.core.fixPath(filepath)])
+                self.launchScene(appPath, "--studio", filepath)
                 fileStarted = True
                 #self.plugin.launch_mode = nukestudio
         else:
@@ -136,14 +212,14 @@ class Prism_Hiero_externalAccess_Functions(object):
                 if self.hieroPath is not None and os.path.exists(self.hieroPath):
                     appPath = self.hieroPath
                 else:
-                    QMessageBox.warning(
+                    QtWidgets.QMessageBox.warning(
                         self.core.messageParent,
                         "Warning",
                         "Nuke executable doesn't exist:\n\n%s" % self.hieroPath,
                     )
 
             if appPath is not None and appPath != "":
-                subprocess.Popen([appPath, "--hiero", self.core.fixPath(filepath)])
+                self.launchScene(appPath, "--hiero", filepath)
                 fileStarted = True
                 #self.plugin.launch_mode = hiero
                 #raise ValueError( "{0}, {1}, {2}".format(appPath, "--hiero", self.core.fixPath(filepath)) )
@@ -157,9 +233,56 @@ class Prism_Hiero_externalAccess_Functions(object):
         return fileStarted
     """
 
+    @err_catcher(name=__name__)
+    def launchScene(self, appPath, flag, filepath):
+        import Prism_Hiero_Delta
+        from Prism_Hiero_Save import rebuildVersion, getStagedVersionEnvironment
+
+        filepath = self.core.fixPath(filepath)
+        env = None
+        if Prism_Hiero_Delta.isDeltaFile(filepath):
+            stagingPath = rebuildVersion(filepath)
+            env = getStagedVersionEnvironment(stagingPath, filepath)
+        else:
+            stagingPath = filepath
+
+        if self.settings.get("launcherpool"):
+            # pooled processes open the version through openScene, which
+            # reuses the rebuilt staging file
+            if self.getLauncherPool().open(appPath, [flag], filepath):
+                return
+
+        subprocess.Popen([appPath, flag, stagingPath], env=env)
 
     @err_catcher(name=__name__)
+    def getLauncherPool(self):
+        if not hasattr(self, "launcherPool"):
+            from Prism_Hiero_Launcher import Prism_Hiero_LauncherPool
+
+            self.launcherPool = Prism_Hiero_LauncherPool()
+
+        return self.launcherPool
+
+    @err_catcher(name=__name__)
+    def getLauncherMetrics(self):
+        if not hasattr(self, "launcherPool"):
+            return []
+
+        return list(self.launcherPool.metrics)
+
+
+    @err_catcher(name=__name__)
+    @profiled()
     def getHieroPath(self, origin):
+        self.hieroPath = None
+        if platform.system() == "Windows":
+            self.hieroPath = self.getHieroPathFromRegistry()
+
+        if self.hieroPath is None:
+            self.hieroPath = self.getExecutableFinder().getExecutable(self.appVersionPresets)
+
+    @err_catcher(name=__name__)
+    def getHieroPathFromRegistry(self):
         try:
             ext = ".hrox"
             class_root = _winreg.QueryValue(_winreg.HKEY_CLASSES_ROOT, ext)
@@ -171,9 +294,66 @@ class Prism_Hiero_externalAccess_Functions(object):
 
             command = command.rsplit(" ", 1)[0][1:-1]
 
-            self.hieroPath = command
+            return command
         except:
-            self.hieroPath = None
+            return None
+
+    @err_catcher(name=__name__)
+    def getExecutableFinder(self):
+        if not hasattr(self, "executableFinder"):
+            from Prism_Hiero_Executables import Prism_Hiero_ExecutableFinder
+
+            self.executableFinder = Prism_Hiero_ExecutableFinder()
+
+        return self.executableFinder
+
+    @err_catcher(name=__name__)
+    @profiled()
+    def getSceneMetadata(self, filepath):
+        if os.path.splitext(filepath)[1] not in self.sceneFormats or not os.path.exists(filepath):
+            return None
+
+        try:
+            return self.metadataCache.getMetadata(filepath)
+        except Exception as e:
+            logger.debug("failed to read the metadata of %s: %s" % (filepath, e))
+            return None
+
+    @err_catcher(name=__name__)
+    def getSceneMetadataText(self, filepath, metadata=None):
+        if metadata is None:
+            metadata = self.getSceneMetadata(filepath)
+
+        if not metadata:
+            return None
+
+        from Prism_Hiero_Metadata import formatMetadata
+
+        return formatMetadata(metadata)
+
+    @err_catcher(name=__name__)
+    def getScenePreview(self, filepath):
+        return self.thumbnailCache.getPath(filepath)
+
+    @err_catcher(name=__name__)
+    def getScenePreviewPath(self, filepath):
+        getPreviewPath = getattr(self.core.entities, "getScenePreviewPath", None)
+        if getPreviewPath:
+            return getPreviewPath(filepath)
+
+        return os.path.splitext(filepath)[0] + "preview.jpg"
+
+    @err_catcher(name=__name__)
+    def setProfilingEnabled(self, enabled):
+        profiler.setEnabled(enabled)
+
+    @err_catcher(name=__name__)
+    def getProfilingStats(self):
+        return profiler.getStats()
+
+    @err_catcher(name=__name__)
+    def exportProfilingData(self, path, fmt="json"):
+        return profiler.export(path, fmt=fmt)
 
     @err_catcher(name=__name__)
     def getPresetScenes(self, presetScenes):